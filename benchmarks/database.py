@@ -0,0 +1,18 @@
+import os
+
+BENCHMARK_DATABASE_NAME = 'multibot_benchmark'
+
+
+def create_database(database: str):
+    match database:
+        case 'none':
+            os.environ.pop('DATABASE_NAME', None)
+            return
+        case 'mongomock':
+            import mongomock
+            return mongomock.MongoClient(tz_aware=True)[BENCHMARK_DATABASE_NAME]
+        case uri:
+            import pymongo
+            client = pymongo.MongoClient(uri, tz_aware=True)
+            client.drop_database(BENCHMARK_DATABASE_NAME)
+            return client[BENCHMARK_DATABASE_NAME]
@@ -0,0 +1,70 @@
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+MODULES = (
+    'multibot',
+    'multibot.bots.discord_bot',
+    'multibot.bots.telegram_bot',
+    'multibot.bots.twitch_bot'
+)
+SDK_MODULES = ('discord', 'telethon', 'twitchio')
+SCRIPT = '''
+import json
+import resource
+import sys
+import time
+
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+
+print(json.dumps({{
+    'seconds': elapsed,
+    'max_rss_kb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    'sdks': [sdk for sdk in {sdk_modules!r} if sdk in sys.modules]
+}}))
+'''
+
+
+def measure(module: str, repeat: int) -> dict:
+    runs = []
+    for _ in range(repeat):
+        process = subprocess.run(
+            (sys.executable, '-c', SCRIPT.format(module=module, sdk_modules=SDK_MODULES)),
+            capture_output=True,
+            check=True,
+            text=True
+        )
+        runs.append(json.loads(process.stdout))
+
+    return {
+        'module': module,
+        'median_seconds': statistics.median(run['seconds'] for run in runs),
+        'min_seconds': min(run['seconds'] for run in runs),
+        'median_max_rss_kb': statistics.median(run['max_rss_kb'] for run in runs),
+        'sdks': runs[-1]['sdks']
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure the import time and memory of multibot modules in fresh interpreters.')
+    parser.add_argument('modules', nargs='*', default=MODULES)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--json', action='store_true')
+    args = parser.parse_args()
+
+    results = [measure(module, args.repeat) for module in args.modules]
+
+    if args.json:
+        print(json.dumps(results, indent=4))
+        return
+
+    for result in results:
+        print(f"{result['module']:<32} {result['median_seconds'] * 1000:8.1f} ms (min {result['min_seconds'] * 1000:.1f} ms)  {result['median_max_rss_kb'] / 1024:7.1f} MiB  sdks: {', '.join(result['sdks']) or '-'}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,134 @@
+import argparse
+import asyncio
+import contextlib
+import gc
+import json
+import sys
+import time
+import tracemalloc
+from collections.abc import Callable
+
+from database import create_database
+from multibot import Chat, LoopbackBot, LoopbackClient, Message, Platform, User
+
+CHAT_ID = -1
+
+
+def create_user(i: int) -> User:
+    return User(Platform.LOOPBACK, i, f'user{i}', False, False)
+
+
+def create_chat(i: int) -> Chat:
+    return Chat(Platform.LOOPBACK, CHAT_ID, 'benchmark', CHAT_ID, 'benchmark')
+
+
+def create_message(i: int) -> Message:
+    return Message(Platform.LOOPBACK, i, create_user(i), f'message {i}', chat=create_chat(i))
+
+
+def create_full_message(i: int) -> Message:
+    return Message(
+        Platform.LOOPBACK,
+        i,
+        create_user(i),
+        f'message {i} @user{i + 1} @user{i + 2}',
+        mentions=[create_user(i + 1), create_user(i + 2)],
+        chat=create_chat(i),
+        replied_message=create_message(i - 1)
+    )
+
+
+def measure_objects(create: Callable[[int], object], n: int) -> dict[str, float]:
+    gc.collect()
+    start_time = time.perf_counter()
+    objects = [create(i) for i in range(n)]
+    seconds = time.perf_counter() - start_time
+    del objects
+
+    gc.collect()
+    tracemalloc.start()
+    start_bytes = tracemalloc.get_traced_memory()[0]
+    objects = [create(i) for i in range(n)]
+    bytes_ = tracemalloc.get_traced_memory()[0] - start_bytes
+    tracemalloc.stop()
+    del objects
+
+    return {'us_per_object': seconds / n * 1e6, 'bytes_per_object': bytes_ / n}
+
+
+async def run_cache(n: int, replies: bool, database: str, trace_memory: bool) -> tuple[float, float, int]:
+    bot = LoopbackBot(LoopbackClient(), database=create_database(database))
+
+    @bot.register(always=True)
+    async def callback(message: Message):
+        pass
+
+    await bot.start()
+    bot.client.add_chat(CHAT_ID, 'benchmark', is_group=True)
+    for user_id in range(1, 11):
+        bot.client.add_user(user_id, f'user{user_id}')
+        bot.client.chats[CHAT_ID].users.append(bot.client.users[user_id])
+
+    events = []
+    for i in range(n):
+        reply_to_id = events[-1].id if replies and events else None
+        events.append(bot.client.create_message(CHAT_ID, i % 10 + 1, f'message {i} @user{(i + 1) % 10 + 1}', reply_to_id=reply_to_id))
+
+    gc.collect()
+    if trace_memory:
+        tracemalloc.start()
+    start_bytes = tracemalloc.get_traced_memory()[0]
+    start_cached_messages = len(bot._message_cache)
+    start_time = time.perf_counter()
+    for event in events:
+        await bot.client.dispatch(event)
+    seconds = time.perf_counter() - start_time
+    gc.collect()
+    bytes_ = tracemalloc.get_traced_memory()[0] - start_bytes
+    tracemalloc.stop()
+
+    return seconds, bytes_, len(bot._message_cache) - start_cached_messages
+
+
+def measure_cache(n: int, replies: bool, database: str) -> dict[str, float]:
+    with contextlib.redirect_stdout(sys.stderr):
+        seconds, _, _ = asyncio.run(run_cache(n, replies, database, trace_memory=False))
+        _, bytes_, cached_messages = asyncio.run(run_cache(n, replies, database, trace_memory=True))
+
+    return {
+        'messages': n,
+        'cached_messages': cached_messages,
+        'us_per_message': seconds / n * 1e6,
+        'bytes_per_cached_message': bytes_ / max(cached_messages, 1)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure the memory footprint and construction cost of the event models and of the message cache.')
+    parser.add_argument('--objects', type=int, default=2000)
+    parser.add_argument('--messages', type=int, default=500)
+    parser.add_argument('--database', default='none', help="'none', 'mongomock' or a mongodb uri")
+    parser.add_argument('--json', action='store_true')
+    args = parser.parse_args()
+
+    report = {
+        'objects': {
+            name: measure_objects(create, args.objects)
+            for name, create in (('user', create_user), ('chat', create_chat), ('message', create_message), ('full_message', create_full_message))
+        },
+        'cache': {}
+    }
+    for replies in (False, True):
+        report['cache']['replies' if replies else 'plain'] = measure_cache(args.messages, replies, args.database)
+
+    if args.json:
+        print(json.dumps(report, indent=4))
+    else:
+        for name, result in report['objects'].items():
+            print(f"{name:<14} {result['us_per_object']:9.1f} us/object  {result['bytes_per_object']:9.0f} bytes/object")
+        for name, result in report['cache'].items():
+            print(f"cache {name:<8} {result['us_per_message']:9.1f} us/message {result['bytes_per_cached_message']:9.0f} bytes/cached message ({result['cached_messages']} cached)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,211 @@
+import argparse
+import hashlib
+import json
+import random
+import statistics
+import string
+import sys
+import time
+
+from flanautils import AmbiguityError
+
+from multibot import Message, MultiBot, RegisteredCallback, constants
+
+KEYWORDS = constants.KEYWORDS
+REGISTRATIONS = (
+    ('activate_audit', (KEYWORDS['activate'], KEYWORDS['audit'])),
+    ('activate_chat', (KEYWORDS['activate'], KEYWORDS['chat'])),
+    ('activate_sound', (KEYWORDS['activate'], KEYWORDS['sound'])),
+    ('ban', KEYWORDS['ban']),
+    ('block', KEYWORDS['block']),
+    ('bye', KEYWORDS['bye']),
+    ('change_config', (KEYWORDS['change'], KEYWORDS['config'])),
+    ('config', KEYWORDS['config']),
+    ('deactivate_audit', (KEYWORDS['deactivate'], KEYWORDS['audit'])),
+    ('deactivate_sound', (KEYWORDS['deactivate'], KEYWORDS['sound'])),
+    ('delete', KEYWORDS['delete']),
+    ('delete_message', (KEYWORDS['delete'], KEYWORDS['message'])),
+    ('delete_last_messages', (KEYWORDS['delete'], KEYWORDS['last'], KEYWORDS['message'])),
+    ('hello', KEYWORDS['hello']),
+    ('help', KEYWORDS['help']),
+    ('ignore', KEYWORDS['ignore']),
+    ('mute', KEYWORDS['mute']),
+    ('permission_role', (KEYWORDS['permission'], KEYWORDS['role'])),
+    ('private_message', (KEYWORDS['private'], KEYWORDS['message'])),
+    ('random', KEYWORDS['random']),
+    ('reset', KEYWORDS['reset']),
+    ('role', KEYWORDS['role']),
+    ('send_as_file', KEYWORDS['send_as_file']),
+    ('show_config', (KEYWORDS['show'], KEYWORDS['config'])),
+    ('show_users', (KEYWORDS['show'], KEYWORDS['user'])),
+    ('stop', KEYWORDS['stop']),
+    ('thanks', KEYWORDS['thanks']),
+    ('unban', KEYWORDS['unban']),
+    ('unblock', KEYWORDS['unblock']),
+    ('unmute', KEYWORDS['unmute']),
+    ('update', KEYWORDS['update']),
+    ('weather', ('tiempo', 'weather', 'lluvia', 'rain', 'temperatura', 'temperature')),
+    ('song_info', ('cancion', 'song', 'musica', 'music', 'info', 'nombre', 'name'))
+)
+CORPUS = (
+    'hola bot que tal estas',
+    'hello there, how are you doing today?',
+    'banea a ese pesado que no para de escribir',
+    'ban that spammer please',
+    'borra los ultimos 5 mensajes',
+    'delete the last messages of this chat',
+    'activa el registro de audio del canal',
+    'enable the audit log for this server',
+    'desactiva el sonido que no se oye nada',
+    'muestra la configuracion actual del grupo',
+    'show me the current settings',
+    'cambia la configuracion por defecto',
+    'gracias bot eres el mejor',
+    'thanks a lot mate',
+    'adios a todos, nos vemos mañana',
+    'goodbye everyone see you tomorrow',
+    'calla a ese usuario que no para de hacer ruido',
+    'mute him for a while',
+    'desmutea a pepe que ya se ha portado bien',
+    'unblock the user that was blocked yesterday',
+    'que tiempo va a hacer el sabado en madrid',
+    'will it rain tomorrow in london?',
+    'como se llama esta cancion',
+    'what is the name of this song',
+    'dame un numero aleatorio entre 1 y 10',
+    'pick a random user from the group',
+    'reinicia la configuracion del chat',
+    'dale permisos de rol de admin a juan',
+    'mandame un mensaje privado con los roles',
+    'envialo como archivo sin compresion para que no pierda calidad',
+    'ignora ese mensaje',
+    'para ya de mandar cosas',
+    'ayuda',
+    'lol',
+    'xd',
+    'jajajajajaja que bueno',
+    'alguien se conecta esta noche al server a jugar un rato?',
+    'anyone up for a game tonight?',
+    'el lunes tengo examen y no he estudiado nada',
+    'https://www.youtube.com/watch?v=dQw4w9WgXcQ mira esto',
+    'a ver si actualizas la lista de usuarios del canal',
+    'quien ha borrado mi mensaje de ayer??',
+    'muestra los usuarios del grupo que estan conectados',
+    'no me gusta nada este cambio, ponlo como estaba',
+    'buenas tardes a todos',
+    'holaaaaaa',
+    'taluego',
+    'the quick brown fox jumps over the lazy dog while the bot keeps parsing every single word of this very long sentence to see if anything matches'
+)
+
+
+def create_keywords(keywords: str | tuple, rng: random.Random) -> str | tuple:
+    if isinstance(keywords, str):
+        return ''.join(rng.choices(string.ascii_lowercase, k=len(keywords)))
+
+    return tuple(create_keywords(keywords_, rng) for keywords_ in keywords)
+
+
+def create_registered_callbacks(scale: int, min_score: float, seed: int) -> list[RegisteredCallback]:
+    rng = random.Random(seed)
+    registered_callbacks = []
+
+    for i in range(scale):
+        for name, keywords in REGISTRATIONS:
+            async def callback(message: Message):
+                pass
+
+            if i:
+                callback.__name__ = callback.__qualname__ = f'{name}_{i}'
+                keywords = create_keywords(keywords, rng)
+            else:
+                callback.__name__ = callback.__qualname__ = name
+            registered_callbacks.append(RegisteredCallback(callback, keywords=keywords, min_score=min_score))
+
+    return registered_callbacks
+
+
+def parse(message: Message, registered_callbacks: list[RegisteredCallback], args: argparse.Namespace) -> list[str]:
+    try:
+        return [
+            registered_callback.callback.__name__
+            for registered_callback in MultiBot._parse_callbacks(
+                message,
+                registered_callbacks,
+                args.score_reward_exponent,
+                args.keywords_lenght_penalty,
+                args.min_score_to_match
+            )
+        ]
+    except AmbiguityError:
+        return ['AmbiguityError']
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure the time and results of MultiBot._parse_callbacks over a Spanish/English chat corpus.')
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--scale', type=int, default=1, help='times the registration set is registered, the copies with random keywords of the same shape')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--min-score', type=float, default=constants.PARSER_MIN_SCORE_DEFAULT)
+    parser.add_argument('--score-reward-exponent', type=float, default=constants.PARSER_SCORE_REWARD_EXPONENT)
+    parser.add_argument('--keywords-lenght-penalty', type=float, default=constants.PARSER_KEYWORDS_LENGHT_PENALTY)
+    parser.add_argument('--min-score-to-match', type=float, default=constants.PARSER_MIN_SCORE_TO_MATCH)
+    parser.add_argument('--max-word-length', type=int, default=constants.PARSER_MAX_WORD_LENGTH)
+    parser.add_argument('--save-results', help='json file to save the matched callbacks of each message to')
+    parser.add_argument('--check-results', help='json file with the expected matched callbacks of each message')
+    parser.add_argument('--json', action='store_true')
+    args = parser.parse_args()
+
+    constants.PARSER_MAX_WORD_LENGTH = args.max_word_length
+    registered_callbacks = create_registered_callbacks(args.scale, args.min_score, args.seed)
+    messages = [Message(text=text) for text in CORPUS]
+
+    results = {message.text: parse(message, registered_callbacks, args) for message in messages}
+
+    durations = []
+    for _ in range(args.repeat):
+        for message in messages:
+            start_time = time.perf_counter()
+            parse(message, registered_callbacks, args)
+            durations.append(time.perf_counter() - start_time)
+
+    percentiles = statistics.quantiles(durations, n=100, method='inclusive')
+    report = {
+        'messages': len(messages),
+        'callbacks': len(registered_callbacks),
+        'repeat': args.repeat,
+        'mean_us_per_message': statistics.fmean(durations) * 1e6,
+        'p50_us_per_message': percentiles[49] * 1e6,
+        'p99_us_per_message': percentiles[98] * 1e6,
+        'mean_us_per_message_and_callback': statistics.fmean(durations) / len(registered_callbacks) * 1e6,
+        'results_hash': hashlib.sha256(json.dumps(results, sort_keys=True).encode()).hexdigest()
+    }
+
+    if args.save_results:
+        with open(args.save_results, 'w') as file:
+            json.dump(results, file, indent=4, ensure_ascii=False)
+
+    is_different = False
+    if args.check_results:
+        with open(args.check_results) as file:
+            expected_results = json.load(file)
+        differences = {text: {'expected': expected_results.get(text), 'actual': result} for text, result in results.items() if expected_results.get(text) != result}
+        report['differences'] = differences
+        is_different = bool(differences)
+
+    if args.json:
+        print(json.dumps(report, indent=4, ensure_ascii=False))
+    else:
+        print(f"{report['messages']} messages x {report['callbacks']} callbacks x {report['repeat']} repeats")
+        print(f"mean {report['mean_us_per_message']:.1f} us/message  p50 {report['p50_us_per_message']:.1f} us  p99 {report['p99_us_per_message']:.1f} us")
+        print(f"mean {report['mean_us_per_message_and_callback']:.2f} us/message/callback")
+        print(f"results {report['results_hash']}")
+        for text, difference in report.get('differences', {}).items():
+            print(f'DIFFERENT {text!r}: expected {difference["expected"]}, got {difference["actual"]}')
+
+    if is_different:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
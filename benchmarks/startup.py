@@ -0,0 +1,144 @@
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+import mongomock
+from flanautils import MongoBase
+
+from multibot import Chat, Message, MultiBot, Platform, User
+
+PHASES = ('import', 'sign_in', 'entities', 'commands', 'database', 'ready', 'first_message')
+
+
+class StubClient:
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.commands = []
+
+    async def get_me(self) -> dict:
+        await asyncio.sleep(self.latency)
+        return {'id': 1, 'name': 'stub'}
+
+    async def set_commands(self, commands: list[str]):
+        await asyncio.sleep(self.latency)
+        self.commands = commands
+
+    async def sign_in(self):
+        await asyncio.sleep(self.latency)
+
+
+class StubBot(MultiBot[StubClient]):
+    def __init__(self, latency: float, n_commands: int):
+        super().__init__(token='stub', client=StubClient(latency))
+
+        for i in range(n_commands):
+            self.register(self._on_command, command_name=f'command_{i}', command_description=f'Command {i}', keywords=f'command{i}')
+
+    async def _on_command(self, message: Message):
+        pass
+
+    async def _on_ready(self):
+        if not self._is_initialized:
+            self.platform = Platform.TELEGRAM
+            with self.startup_profiler.phase('entities'):
+                me = await self.client.get_me()
+                self.id = me['id']
+                self.name = me['name']
+
+            with self.startup_profiler.phase('commands'):
+                await self.client.set_commands([registered_callback.command_name for registered_callback in self._registered_callbacks])
+
+        await super()._on_ready()
+
+    async def _start_async(self):
+        with self.startup_profiler.phase('sign_in'):
+            await self.client.sign_in()
+
+        await self._on_ready()
+
+        user = User(Platform.TELEGRAM, 2, 'user')
+        await self._on_new_message_raw(Message(Platform.TELEGRAM, 1, user, 'command0', chat=Chat(Platform.TELEGRAM, 2, 'user')))
+
+
+def run_once(latency: float, n_commands: int) -> dict[str, dict[str, float]]:
+    MongoBase.init_database_attributes(mongomock.MongoClient(tz_aware=True)['multibot'])
+
+    bot = StubBot(latency, n_commands)
+    bot.startup_profiler.is_enabled = True
+    bot.startup_profiler.add_phase('import', bot.startup_profiler.start_time)
+    bot.start()
+
+    return bot.startup_profiler.report()
+
+
+def run_repeated(args: argparse.Namespace) -> dict[str, dict[str, float]]:
+    env = {k: v for k, v in os.environ.items() if k != 'DATABASE_NAME'}
+    reports = []
+    for _ in range(args.repeat):
+        process = subprocess.run(
+            (sys.executable, __file__, '--once', '--latency', str(args.latency), '--commands', str(args.commands)),
+            capture_output=True,
+            check=True,
+            env=env,
+            text=True
+        )
+        reports.append(json.loads(process.stdout.splitlines()[-1]))
+
+    return {
+        phase: {
+            'median_offset_seconds': statistics.median(report[phase]['offset_seconds'] for report in reports),
+            'median_seconds': statistics.median(report[phase]['seconds'] for report in reports),
+            'max_seconds': max(report[phase]['seconds'] for report in reports)
+        }
+        for phase in PHASES
+        if all(phase in report for report in reports)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure the startup phases of a bot running against a stub client and an in-memory database.')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--latency', type=float, default=0, help='simulated seconds per client request')
+    parser.add_argument('--commands', type=int, default=20)
+    parser.add_argument('--baseline', help='json file produced with --json to compare against')
+    parser.add_argument('--tolerance', type=float, default=0.2, help='relative slowdown reported as a regression')
+    parser.add_argument('--json', action='store_true')
+    parser.add_argument('--once', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.once:
+        print(json.dumps(run_once(args.latency, args.commands)))
+        return
+
+    results = run_repeated(args)
+
+    if args.json:
+        print(json.dumps(results, indent=4))
+        return
+
+    baseline = {}
+    if args.baseline:
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+
+    is_regression = False
+    for phase, result in results.items():
+        line = f"{phase:<16} +{result['median_offset_seconds'] * 1000:9.1f} ms {result['median_seconds'] * 1000:9.1f} ms (max {result['max_seconds'] * 1000:.1f} ms)"
+        if phase in baseline:
+            baseline_seconds = baseline[phase]['median_seconds']
+            line += f"  baseline {baseline_seconds * 1000:.1f} ms"
+            if result['median_seconds'] > baseline_seconds * (1 + args.tolerance) and result['median_seconds'] - baseline_seconds > 0.001:
+                is_regression = True
+                line += '  REGRESSION'
+        print(line)
+
+    if is_regression:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
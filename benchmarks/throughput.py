@@ -0,0 +1,143 @@
+import argparse
+import asyncio
+import contextlib
+import datetime
+import itertools
+import json
+import platform
+import random
+import statistics
+import string
+import sys
+import time
+
+from database import create_database
+from multibot import LoopbackBot, LoopbackClient, Message
+
+BOT_ID = 0
+CHAT_ID = -1
+
+
+def create_word(rng: random.Random) -> str:
+    return ''.join(rng.choices(string.ascii_lowercase, k=rng.randint(5, 8)))
+
+
+def create_bot(rng: random.Random, n_callbacks: int, keywords_group_size: int, database) -> tuple[LoopbackBot, list[tuple[str, ...]]]:
+    bot = LoopbackBot(LoopbackClient(), database=database)
+    keywords_groups = []
+
+    for _ in range(n_callbacks):
+        async def callback(message: Message):
+            await bot.send('ok', message)
+
+        keywords_group = tuple(create_word(rng) for _ in range(keywords_group_size))
+        keywords_groups.append(keywords_group)
+        bot.register(callback, keywords=keywords_group)
+
+    return bot, keywords_groups
+
+
+def create_events(
+    rng: random.Random,
+    client: LoopbackClient,
+    keywords_groups: list[tuple[str, ...]],
+    n_messages: int,
+    n_members: int,
+    cache_hit_ratio: float
+) -> list:
+    member_ids = range(1, n_members + 1)
+    for member_id in member_ids:
+        client.add_user(member_id, f'user{member_id}')
+    chat = client.add_chat(CHAT_ID, 'benchmark', is_group=True)
+    chat.users.extend(client.users[member_id] for member_id in member_ids)
+
+    events = []
+    for _ in range(n_messages):
+        if events and rng.random() < cache_hit_ratio:
+            events.append(rng.choice(events))
+            continue
+
+        words = [create_word(rng) for _ in range(rng.randint(2, 6))]
+        words.extend(rng.choice(keywords_groups))
+        words.append(f'@user{rng.choice(member_ids)}')
+        rng.shuffle(words)
+        events.append(client.create_message(CHAT_ID, rng.choice(member_ids), ' '.join(words)))
+
+    return events
+
+
+async def run_case(n_callbacks: int, keywords_group_size: int, n_members: int, cache_hit_ratio: float, args: argparse.Namespace) -> dict:
+    rng = random.Random(args.seed)
+    bot, keywords_groups = create_bot(rng, n_callbacks, keywords_group_size, create_database(args.database))
+    await bot.start()
+    events = create_events(rng, bot.client, keywords_groups, args.warmup + args.messages, n_members, cache_hit_ratio)
+
+    for event in events[:args.warmup]:
+        await bot.client.dispatch(event)
+
+    latencies = []
+    start_time = time.perf_counter()
+    for event in events[args.warmup:]:
+        event_start_time = time.perf_counter()
+        await bot.client.dispatch(event)
+        latencies.append(time.perf_counter() - event_start_time)
+    total_seconds = time.perf_counter() - start_time
+
+    percentiles = statistics.quantiles(latencies, n=100, method='inclusive')
+    return {
+        'callbacks': n_callbacks,
+        'keywords_group_size': keywords_group_size,
+        'members': n_members,
+        'cache_hit_ratio': cache_hit_ratio,
+        'messages': len(latencies),
+        'sent_messages': len(bot.client.sent_messages),
+        'seconds': total_seconds,
+        'messages_per_second': len(latencies) / total_seconds,
+        'p50_ms': percentiles[49] * 1000,
+        'p99_ms': percentiles[98] * 1000,
+        'max_ms': max(latencies) * 1000
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure the message throughput and latency of the dispatch path with the loopback bot.')
+    parser.add_argument('--callbacks', type=int, nargs='+', default=(1, 10, 50))
+    parser.add_argument('--keywords', type=int, nargs='+', default=(1, 3), help='keywords per registered callback')
+    parser.add_argument('--members', type=int, nargs='+', default=(10, 1000), help='group members scanned for mentions')
+    parser.add_argument('--cache-hit-ratios', type=float, nargs='+', default=(0, 0.5))
+    parser.add_argument('--messages', type=int, default=200)
+    parser.add_argument('--warmup', type=int, default=20)
+    parser.add_argument('--database', default='none', help="'none', 'mongomock' or a mongodb uri")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help='json file to write the results to (stdout by default)')
+    args = parser.parse_args()
+
+    cases = []
+    for n_callbacks, keywords_group_size, n_members, cache_hit_ratio in itertools.product(args.callbacks, args.keywords, args.members, args.cache_hit_ratios):
+        with contextlib.redirect_stdout(sys.stderr):
+            case = asyncio.run(run_case(n_callbacks, keywords_group_size, n_members, cache_hit_ratio, args))
+        print(
+            f"callbacks={n_callbacks:<4} keywords={keywords_group_size:<3} members={n_members:<6} cache_hit_ratio={cache_hit_ratio:<5} "
+            f"{case['messages_per_second']:9.1f} msg/s  p50 {case['p50_ms']:8.2f} ms  p99 {case['p99_ms']:8.2f} ms",
+            file=sys.stderr
+        )
+        cases.append(case)
+
+    results = {
+        'date': datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        'python': sys.version,
+        'platform': platform.platform(),
+        'database': args.database if args.database in ('none', 'mongomock') else 'mongodb',
+        'seed': args.seed,
+        'cases': cases
+    }
+
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(results, file, indent=4)
+    else:
+        print(json.dumps(results, indent=4))
+
+
+if __name__ == '__main__':
+    main()
@@ -1,4 +1,30 @@
-from multibot.bots import *
+import time
+
+_import_start_time = time.perf_counter()
+
+from typing import Any
+
+from multibot import bots, constants
+from multibot.bots.multi_bot import *
 from multibot.constants import *
 from multibot.exceptions import *
 from multibot.models import *
+
+MultiBot.startup_profiler.start_time = _import_start_time
+
+
+def __dir__() -> list[str]:
+    return sorted({*globals(), *bots.__all__, *dir(constants)})
+
+
+def __getattr__(name: str) -> Any:
+    if name == '__all__':
+        return [name for name in __dir__() if not name.startswith('_')]
+
+    for module in (bots, constants):
+        try:
+            return getattr(module, name)
+        except AttributeError:
+            pass
+
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
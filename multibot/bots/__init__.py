@@ -1,4 +1,35 @@
-from multibot.bots.discord_bot import *
+import importlib
+from typing import Any
+
+from multibot.bots import multi_bot
 from multibot.bots.multi_bot import *
-from multibot.bots.telegram_bot import *
-from multibot.bots.twitch_bot import *
+
+_LAZY_ATTRIBUTES = {
+    'DiscordBot': 'multibot.bots.discord_bot',
+    'DiscordShardRunner': 'multibot.bots.discord_shard_runner',
+    'LoopbackBot': 'multibot.bots.loopback_bot',
+    'LoopbackButtonEvent': 'multibot.bots.loopback_bot',
+    'LoopbackChat': 'multibot.bots.loopback_bot',
+    'LoopbackClient': 'multibot.bots.loopback_bot',
+    'LoopbackMessage': 'multibot.bots.loopback_bot',
+    'LoopbackUser': 'multibot.bots.loopback_bot',
+    'TelegramBot': 'multibot.bots.telegram_bot',
+    'use_user_client': 'multibot.bots.telegram_bot',
+    'user_client': 'multibot.bots.telegram_bot',
+    'TwitchBot': 'multibot.bots.twitch_bot'
+}
+
+__all__ = [*multi_bot.__all__, *_LAZY_ATTRIBUTES]
+
+
+def __dir__() -> list[str]:
+    return sorted({*globals(), *_LAZY_ATTRIBUTES})
+
+
+def __getattr__(name: str) -> Any:
+    try:
+        module_name = _LAZY_ATTRIBUTES[name]
+    except KeyError:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}') from None
+
+    return getattr(importlib.import_module(module_name), name)
@@ -1,13 +1,17 @@
 __all__ = ['DiscordBot']
 
+import asyncio
 import contextlib
 import datetime
+import functools
 import io
 import logging
 import pathlib
 import random
 import re
+import time
 import traceback
+from collections import OrderedDict
 from collections.abc import Awaitable, Callable, Iterable, Sequence
 from typing import Any
 
@@ -19,19 +23,70 @@ from flanautils import Media, MediaType, NotFoundError, OrderedSet, ResponseErro
 from multibot import constants
 from multibot.bots.multi_bot import MultiBot, parse_arguments
 from multibot.exceptions import BadRoleError, LimitError, SendError, UserDisconnectedError
-from multibot.models import Button, Chat, Message, Mute, Platform, RegisteredCallback, Role, User
+from multibot.models import Button, Chat, DiscordCacheProfile, Lazy, Message, Mute, Platform, RegisteredCallback, Role, SendPriority, SendScheduler, StoredMedia, User
 
 
 # ----------------------------------------------------------------------------------------------------- #
 # -------------------------------------------- DISCORD_BOT -------------------------------------------- #
 # ----------------------------------------------------------------------------------------------------- #
 class DiscordBot(MultiBot[discord.ext.commands.Bot]):
-    def __init__(self, token: str):
+    event_types = (constants.DISCORD_EVENT,)
+
+    def __init__(
+        self,
+        token: str,
+        shard_count: int | None = None,
+        shard_ids: Sequence[int] | None = None,
+        auto_sharded=False,
+        cache_profile: DiscordCacheProfile = DiscordCacheProfile.FULL,
+        intents: discord.Intents | None = None,
+        member_cache_flags: discord.MemberCacheFlags | None = None,
+        chunk_guilds_at_startup: bool | None = None
+    ):
+        match cache_profile:
+            case DiscordCacheProfile.FULL:
+                default_intents = discord.Intents.all()
+                default_member_cache_flags = discord.MemberCacheFlags.all()
+                default_chunk_guilds_at_startup = True
+            case DiscordCacheProfile.LEAN:
+                default_intents = discord.Intents.default()
+                default_intents.members = True
+                default_intents.message_content = True
+                default_member_cache_flags = discord.MemberCacheFlags.none()
+                default_member_cache_flags.voice = True
+                default_chunk_guilds_at_startup = False
+            case _:
+                raise ValueError('bad cache profile')
+
+        client_kwargs = {
+            'command_prefix': constants.DISCORD_COMMAND_PREFIX,
+            'intents': intents or default_intents,
+            'member_cache_flags': member_cache_flags or default_member_cache_flags,
+            'chunk_guilds_at_startup': default_chunk_guilds_at_startup if chunk_guilds_at_startup is None else chunk_guilds_at_startup
+        }
+        if auto_sharded or shard_count or shard_ids:
+            client = discord.ext.commands.AutoShardedBot(
+                **client_kwargs,
+                shard_count=shard_count,
+                shard_ids=list(shard_ids) if shard_ids is not None else None
+            )
+        else:
+            client = discord.ext.commands.Bot(**client_kwargs)
+
         super().__init__(
             token=token,
-            client=discord.ext.commands.Bot(command_prefix=constants.DISCORD_COMMAND_PREFIX, intents=discord.Intents.all()),
-            message_max_characters=constants.DISCORD_MESSAGE_MAX_CHARACTERS
+            client=client,
+            message_max_characters=constants.DISCORD_MESSAGE_MAX_CHARACTERS,
+            send_scheduler=SendScheduler(
+                constants.DISCORD_SEND_GLOBAL_TIMES,
+                constants.DISCORD_SEND_GLOBAL_SECONDS,
+                constants.DISCORD_SEND_CHAT_TIMES,
+                constants.DISCORD_SEND_CHAT_SECONDS
+            )
         )
+        self._group_members: OrderedDict[int, tuple[float, list[discord.Member]]] = OrderedDict()
+        self._group_members_fetches: dict[int, asyncio.Task] = {}
+        self._group_members_queries: OrderedDict[tuple[int, str], tuple[float, list[discord.Member]]] = OrderedDict()
 
     # -------------------------------------------------------- #
     # ------------------- PROTECTED METHODS ------------------ #
@@ -161,11 +216,109 @@ class DiscordBot(MultiBot[discord.ext.commands.Bot]):
             case self.Message() as message:
                 return message.chat.original_object.guild
 
+    async def _get_discord_group_members(self, discord_group: constants.DISCORD_GROUP) -> list[discord.Member]:
+        if discord_group.chunked:
+            return discord_group.members
+
+        try:
+            fetch_date, members = self._group_members[discord_group.id]
+        except KeyError:
+            pass
+        else:
+            if time.monotonic() - fetch_date < constants.DISCORD_MEMBERS_CACHE_SECONDS:
+                self._group_members.move_to_end(discord_group.id)
+                return members
+
+        async def fetch_members() -> list[discord.Member]:
+            members_ = [member async for member in discord_group.fetch_members(limit=None)]
+            self._group_members[discord_group.id] = (time.monotonic(), members_)
+            self._group_members.move_to_end(discord_group.id)
+            while len(self._group_members) > constants.DISCORD_MEMBERS_CACHE_SIZE:
+                self._group_members.popitem(last=False)
+            return members_
+
+        try:
+            fetch = self._group_members_fetches[discord_group.id]
+        except KeyError:
+            fetch = self._group_members_fetches[discord_group.id] = asyncio.create_task(fetch_members())
+            fetch.add_done_callback(lambda _: self._group_members_fetches.pop(discord_group.id, None))
+
+        return await asyncio.shield(fetch)
+
+    async def _get_discord_group_members_by_names(self, discord_group: constants.DISCORD_GROUP, names: Iterable[str]) -> list[discord.Member]:
+        if discord_group.chunked:
+            return discord_group.members
+
+        members = []
+        names_to_query = []
+        for name in OrderedSet(names):
+            try:
+                query_date, name_members = self._group_members_queries[discord_group.id, name]
+            except KeyError:
+                pass
+            else:
+                if time.monotonic() - query_date < constants.DISCORD_MEMBERS_CACHE_SECONDS:
+                    self._group_members_queries.move_to_end((discord_group.id, name))
+                    members.extend(name_members)
+                    continue
+            names_to_query.append(name)
+
+        if not names_to_query:
+            return members
+
+        queries = {
+            asyncio.create_task(discord_group.query_members(name, limit=constants.DISCORD_MEMBERS_QUERY_LIMIT, cache=False)): name
+            for name in names_to_query
+        }
+        done_queries, pending_queries = await asyncio.wait(queries, timeout=constants.DISCORD_MEMBERS_QUERY_TIMEOUT_SECONDS)
+        for query in pending_queries:
+            query.cancel()
+        if pending_queries:
+            print(f'{len(pending_queries)} of {len(queries)} member queries timed out in {discord_group.name}')
+
+        for query in done_queries:
+            if query.exception():
+                continue
+
+            key = (discord_group.id, queries[query])
+            self._group_members_queries[key] = (time.monotonic(), query.result())
+            self._group_members_queries.move_to_end(key)
+            members.extend(query.result())
+        while len(self._group_members_queries) > constants.DISCORD_MEMBERS_QUERY_CACHE_SIZE:
+            self._group_members_queries.popitem(last=False)
+
+        return members
+
     @return_if_first_empty(exclude_self_types='DiscordBot', globals_=globals())
     async def _get_edit_date(self, original_message: constants.DISCORD_EVENT) -> datetime.datetime | None:
         if not isinstance(original_message, constants.DISCORD_INTERACTION_EVENT):
             return original_message.edited_at
 
+    @return_if_first_empty(exclude_self_types='DiscordBot', globals_=globals())
+    async def _get_event_chat_id(self, event: constants.DISCORD_EVENT) -> int | None:
+        if isinstance(event, constants.DISCORD_INTERACTION_EVENT):
+            return event.channel_id
+        else:
+            return event.channel.id
+
+    @return_if_first_empty(exclude_self_types='DiscordBot', globals_=globals())
+    async def _get_event_user_id(self, event: constants.DISCORD_EVENT) -> int | None:
+        if isinstance(event, constants.DISCORD_INTERACTION_EVENT):
+            return event.user.id
+        else:
+            return event.author.id
+
+    async def _get_lazy_replied_message(self, original_message: constants.DISCORD_EVENT, replied_message_id: int | str | None, chat: Chat) -> Message | Lazy | None:
+        try:
+            replied_original_message = original_message.reference.resolved
+        except AttributeError:
+            replied_original_message = None
+
+        if isinstance(replied_original_message, constants.DISCORD_MESSAGE) and (replied_message_id, chat.id) not in self._message_cache:
+            return await self._get_message(replied_original_message)
+
+        return await super()._get_lazy_replied_message(original_message, replied_message_id, chat)
+
     @return_if_first_empty(exclude_self_types='DiscordBot', globals_=globals())
     async def _get_mentions(self, original_message: constants.DISCORD_EVENT) -> list[User]:
         mentions = OrderedSet()
@@ -179,7 +332,11 @@ class DiscordBot(MultiBot[discord.ext.commands.Bot]):
         words = text.lower().split()
 
         if chat.is_group:
-            for member in chat.original_object.guild.members:
+            names = [
+                name for word in words
+                if constants.DISCORD_USER_NAME_MIN_CHARACTERS <= len(name := word.split('#')[0]) <= constants.DISCORD_USER_NAME_MAX_CHARACTERS
+            ]
+            for member in await self._get_discord_group_members_by_names(chat.original_object.guild, names):
                 user_name = f'{member.name}#{member.discriminator}'.lower()
                 short_user_name = member.name.lower()
                 if user_name in words or short_user_name in words:
@@ -218,6 +375,13 @@ class DiscordBot(MultiBot[discord.ext.commands.Bot]):
         if not isinstance(replied_original_message, discord.DeletedReferencedMessage):
             return await self._get_message(replied_original_message)
 
+    @return_if_first_empty(exclude_self_types='DiscordBot', globals_=globals())
+    async def _get_replied_message_id(self, original_message: constants.DISCORD_EVENT) -> int | str | None:
+        try:
+            return original_message.reference.message_id
+        except AttributeError:
+            pass
+
     @return_if_first_empty(exclude_self_types='DiscordBot', globals_=globals())
     async def _get_text(self, original_message: constants.DISCORD_EVENT) -> str:
         if (command_text := await self._get_command_text(original_message)) is None:
@@ -256,14 +420,14 @@ class DiscordBot(MultiBot[discord.ext.commands.Bot]):
             .replace('</code>', '`')
         )
 
-    @staticmethod
-    @return_if_first_empty
-    async def _prepare_media_to_send(media: Media, raise_exceptions=False) -> discord.File | None:
+    @return_if_first_empty(exclude_self_types='DiscordBot', globals_=globals())
+    async def _prepare_media_to_send(self, media: Media, raise_exceptions=False) -> discord.File | None:
         if not media:
             return
 
         file_stem = media.title or 'bot_media'
         file_name = f"{file_stem}{f'.{media.extension}' if media.extension else ''}"
+        input_file = await media.load_bytes() if isinstance(media, StoredMedia) else media.bytes_
 
         if media.url:
             if pathlib.Path(media.url).is_file():
@@ -271,24 +435,31 @@ class DiscordBot(MultiBot[discord.ext.commands.Bot]):
                     return discord.File(media.url)
                 else:
                     return discord.File(media.url, filename=file_name)
-            elif not media.bytes_:
+            elif not input_file:
+                max_bytes = None if media.type_ is MediaType.GIF or media.title else constants.DISCORD_MEDIA_MAX_BYTES
                 try:
-                    media.bytes_ = await flanautils.get_request(media.url)
+                    input_file = await self.media_cache.fetch_file(media.url, max_bytes)
                 except ResponseError:
                     if raise_exceptions:
                         raise
 
-        if bytes_ := media.bytes_:
+        if input_file:
             if media.type_ is MediaType.GIF:
-                bytes_ = await flanautils.to_gif(bytes_)
+                input_file = await self.media_processor.to_gif(input_file)
             if media.title:
                 try:
-                    bytes_ = await flanautils.edit_metadata(bytes_, {'title': file_stem}, overwrite=False)
+                    input_file = await self.media_processor.edit_metadata(input_file, {'title': file_stem}, overwrite=False)
                 except FileNotFoundError:
                     pass
-            if len(bytes_) > constants.DISCORD_MEDIA_MAX_BYTES:
+
+            if isinstance(input_file, bytes):
+                if len(input_file) > constants.DISCORD_MEDIA_MAX_BYTES:
+                    raise LimitError
+                return discord.File(fp=io.BytesIO(input_file), filename=file_name)
+
+            if input_file.stat().st_size > constants.DISCORD_MEDIA_MAX_BYTES:
                 raise LimitError
-            return discord.File(fp=io.BytesIO(bytes_), filename=file_name)
+            return discord.File(input_file, filename=file_name)
 
     async def _register_commands(self) -> None:
         def create_wrapper(
@@ -298,15 +469,15 @@ class DiscordBot(MultiBot[discord.ext.commands.Bot]):
             async def wrapper(interaction: discord.Interaction, text: str | None = None) -> None:
                 await self.accept_button_event(interaction)
 
+                if self.rate_limit and await self._is_event_rate_limited(interaction):
+                    await interaction.followup.send('✖')
+                    return
+
                 try:
                     message = await self._get_message(interaction)
 
                     await self._on_new_message_raw(message)
-                    await registered_callback_.callback(
-                        message,
-                        *registered_callback_.extra_args,
-                        **registered_callback_.extra_kwargs
-                    )
+                    await self._run_registered_callback(message, registered_callback_)
                 except Exception:
                     await interaction.followup.send('✖')
                     raise
@@ -327,12 +498,18 @@ class DiscordBot(MultiBot[discord.ext.commands.Bot]):
                 )
             )
 
-        await self.client.tree.sync()
+        if self.is_main_instance:
+            await self._sync_commands(
+                [command.to_dict(self.client.tree) for command in self.client.tree.get_commands()],
+                self.client.tree.sync
+            )
 
     async def _start_async(self):
         self._add_handlers()
         async with self.client:
-            await self.client.start(self.token)
+            with self.startup_profiler.phase('sign_in'):
+                await self.client.login(self.token)
+            await self.client.connect()
 
     async def _unban(self, user: int | str | User, group_: int | str | Chat | Message, message: Message = None):
         user = await self.get_user(user)
@@ -356,9 +533,11 @@ class DiscordBot(MultiBot[discord.ext.commands.Bot]):
             self.platform = Platform.DISCORD
             self.id = self.client.user.id
             self.name = self.client.user.name
-            self.owner_id = (await self.client.application_info()).owner.id
+            with self.startup_profiler.phase('entities'):
+                self.owner_id = (await self.client.application_info()).owner.id
 
-            await self._register_commands()
+            with self.startup_profiler.phase('commands'):
+                await self._register_commands()
 
             discord.utils.setup_logging(level=logging.ERROR)
 
@@ -490,7 +669,7 @@ class DiscordBot(MultiBot[discord.ext.commands.Bot]):
 
         users = []
         discord_group = await self._get_discord_group(group_)
-        for original_user in discord_group.members:
+        for original_user in await self._get_discord_group_members(discord_group):
             for original_role in original_user.roles:
                 if original_role.id not in role_ids:
                     break
@@ -585,8 +764,12 @@ class DiscordBot(MultiBot[discord.ext.commands.Bot]):
         try:
             if group_ is None:
                 original_user = self.client.get_user(user_id) or await self.client.fetch_user(user_id)
-            elif not (discord_group := await self._get_discord_group(group_)) or not (original_user := discord_group.get_member(user_id)):
+            elif not (discord_group := await self._get_discord_group(group_)):
                 return
+            elif not (original_user := discord_group.get_member(user_id)):
+                if discord_group.chunked:
+                    return
+                original_user = await discord_group.fetch_member(user_id)
         except discord.errors.NotFound:
             return
 
@@ -595,7 +778,7 @@ class DiscordBot(MultiBot[discord.ext.commands.Bot]):
     @return_if_first_empty(exclude_self_types='DiscordBot', globals_=globals())
     async def get_users(self, group_: int | str | Chat | Message) -> list[User]:
         discord_group = await self._get_discord_group(group_)
-        return [await self._create_user_from_discord_user(member) for member in discord_group.members]
+        return [await self._create_user_from_discord_user(member) for member in await self._get_discord_group_members(discord_group)]
 
     async def has_role(self, user: int | str | User, group_: int | str | Chat | Message, role: int | str | Role) -> bool:
         user = await self.get_user(user, group_)
@@ -612,6 +795,10 @@ class DiscordBot(MultiBot[discord.ext.commands.Bot]):
         except AttributeError:
             raise UserDisconnectedError(user.name)
 
+    @property
+    def is_main_instance(self) -> bool:
+        return not (shard_ids := getattr(self.client, 'shard_ids', None)) or 0 in shard_ids
+
     async def is_muted(self, user: int | str | User, group_: int | str | Chat | Message) -> bool:
         user = await self.get_user(user, group_)
         try:
@@ -680,6 +867,7 @@ class DiscordBot(MultiBot[discord.ext.commands.Bot]):
         enable_link_previews: bool = True,
         silent: bool = False,
         send_as_file: bool = None,
+        priority: SendPriority = None,
         raise_exceptions=False,
         edit=False
     ) -> Message | None:
@@ -734,13 +922,18 @@ class DiscordBot(MultiBot[discord.ext.commands.Bot]):
                 kwargs['view'] = view
 
             try:
-                message.original_object = await message.original_object.edit(**kwargs)
+                message.original_object = await self._schedule_send(
+                    functools.partial(message.original_object.edit, **kwargs),
+                    chat,
+                    message,
+                    priority
+                )
             except discord.errors.NotFound:
                 if raise_exceptions:
                     raise
                 return
 
-            return self._update_message_attributes(
+            return await self._update_message_attributes(
                 message,
                 media,
                 buttons,
@@ -766,13 +959,19 @@ class DiscordBot(MultiBot[discord.ext.commands.Bot]):
         for text_part in text_parts:
             try:
                 bot_message = await self._get_message(
-                    await chat.original_object.send(
-                        text_part,
-                        file=file,
-                        view=view,
-                        reference=reply_to,
-                        suppress_embeds=not enable_link_previews,
-                        silent=silent
+                    await self._schedule_send(
+                        functools.partial(
+                            chat.original_object.send,
+                            text_part,
+                            file=file,
+                            view=view,
+                            reference=reply_to,
+                            suppress_embeds=not enable_link_previews,
+                            silent=silent
+                        ),
+                        chat,
+                        message,
+                        priority
                     )
                 )
             except discord.errors.HTTPException as e:
@@ -784,7 +983,7 @@ class DiscordBot(MultiBot[discord.ext.commands.Bot]):
 
                 return
 
-            self._update_message_attributes(bot_message, media, buttons, chat, buttons_key, data)
+            await self._update_message_attributes(bot_message, media, buttons, chat, buttons_key, data)
 
         # noinspection PyUnboundLocalVariable
         return bot_message
@@ -0,0 +1,51 @@
+__all__ = ['DiscordShardRunner']
+
+import multiprocessing
+import multiprocessing.process
+from collections.abc import Callable
+
+from multibot.bots.discord_bot import DiscordBot
+
+
+def _run_shards(bot_factory: Callable[[int, list[int]], DiscordBot], shard_count: int, shard_ids: list[int]):
+    bot_factory(shard_count, shard_ids).start()
+
+
+class DiscordShardRunner:
+    def __init__(self, bot_factory: Callable[[int, list[int]], DiscordBot], shard_count: int, n_processes: int = None):
+        self.bot_factory = bot_factory
+        self.shard_count = shard_count
+        self.n_processes = min(n_processes or multiprocessing.cpu_count(), shard_count)
+        self.processes: list[multiprocessing.process.BaseProcess] = []
+
+    @property
+    def shard_ranges(self) -> list[list[int]]:
+        shards_per_process, remainder = divmod(self.shard_count, self.n_processes)
+        shard_ranges = []
+        start = 0
+        for i in range(self.n_processes):
+            end = start + shards_per_process + (i < remainder)
+            shard_ranges.append(list(range(start, end)))
+            start = end
+
+        return shard_ranges
+
+    def start(self):
+        context = multiprocessing.get_context('spawn')
+        for shard_ids in self.shard_ranges:
+            process = context.Process(target=_run_shards, args=(self.bot_factory, self.shard_count, shard_ids), name=f'discord_shards_{shard_ids[0]}-{shard_ids[-1]}')
+            process.start()
+            self.processes.append(process)
+
+        try:
+            for process in self.processes:
+                process.join()
+        except KeyboardInterrupt:
+            self.stop()
+
+    def stop(self):
+        for process in self.processes:
+            process.terminate()
+        for process in self.processes:
+            process.join()
+        self.processes.clear()
@@ -0,0 +1,558 @@
+__all__ = ['LoopbackButtonEvent', 'LoopbackChat', 'LoopbackClient', 'LoopbackMessage', 'LoopbackUser', 'LoopbackBot']
+
+import asyncio
+import contextlib
+import datetime
+import functools
+import itertools
+import re
+from collections.abc import Awaitable, Callable, Iterable, Iterator
+from dataclasses import dataclass, field
+from typing import Any
+
+import flanautils
+import pymongo
+import pymongo.database
+from flanautils import Media, MongoBase, OrderedSet, return_if_first_empty
+
+from multibot.bots.multi_bot import MultiBot, find_message, parse_arguments
+from multibot.models import Button, Chat, Message, Platform, SendPriority, SendScheduler, User
+
+
+# ---------------------------------------------------------------------------------------------------- #
+# ------------------------------------------- FAKE OBJECTS ------------------------------------------- #
+# ---------------------------------------------------------------------------------------------------- #
+@dataclass(eq=False)
+class LoopbackUser:
+    id: int
+    name: str = None
+    is_admin: bool = False
+    is_bot: bool = False
+
+
+@dataclass(eq=False)
+class LoopbackChat:
+    id: int
+    name: str = None
+    is_group: bool = False
+    users: list[LoopbackUser] = field(default_factory=list)
+
+
+@dataclass(eq=False)
+class LoopbackMessage:
+    id: int
+    chat: LoopbackChat
+    author: LoopbackUser
+    text: str = ''
+    media: Media = None
+    buttons: list[list[Button]] = None
+    mentions: list[LoopbackUser] = field(default_factory=list)
+    reply_to: LoopbackMessage = None
+    date: datetime.datetime = field(default_factory=lambda: datetime.datetime.now(datetime.timezone.utc))
+    edit_date: datetime.datetime = None
+    is_deleted: bool = False
+
+    @property
+    def command_name(self) -> str | None:
+        if match := re.match(r'/(\w+)', self.text or ''):
+            return match.group(1)
+
+
+@dataclass(eq=False)
+class LoopbackButtonEvent:
+    message: LoopbackMessage
+    text: str
+    presser: LoopbackUser
+
+
+# ---------------------------------------------------------------------------------------------------- #
+# ------------------------------------------ LOOPBACK_CLIENT ----------------------------------------- #
+# ---------------------------------------------------------------------------------------------------- #
+class LoopbackClient:
+    def __init__(self, latency: float = 0, me: LoopbackUser = None):
+        self.latency = latency
+        self.me = me or LoopbackUser(0, 'loopback', is_bot=True)
+        self.users: dict[int, LoopbackUser] = {self.me.id: self.me}
+        self.chats: dict[int, LoopbackChat] = {}
+        self.messages: dict[tuple[int, int], LoopbackMessage] = {}
+        self.sent_messages: list[LoopbackMessage] = []
+        self.commands: list[dict] = []
+        self.banned: set[tuple[int, int]] = set()
+        self.muted: set[tuple[int, int]] = set()
+        self._event_handlers: list[tuple[Callable[[Any], Awaitable], type, str | None]] = []
+        self._message_ids = itertools.count(1)
+
+    async def _wait(self):
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+    def add_chat(self, id: int, name: str = None, is_group: bool = False) -> LoopbackChat:
+        if not (chat := self.chats.get(id)):
+            chat = self.chats[id] = LoopbackChat(id, name or str(id), is_group)
+            if not is_group and id in self.users:
+                chat.users.append(self.users[id])
+        return chat
+
+    def add_event_handler(self, callback: Callable[[Any], Awaitable], event_type: type, command_name: str = None):
+        self._event_handlers.append((callback, event_type, command_name))
+
+    def add_user(self, id: int, name: str = None, is_admin: bool = False, is_bot: bool = False) -> LoopbackUser:
+        if not (user := self.users.get(id)):
+            user = self.users[id] = LoopbackUser(id, name or str(id), is_admin, is_bot)
+        return user
+
+    def create_message(
+        self,
+        chat_id: int,
+        author_id: int,
+        text: str = '',
+        *,
+        message_id: int = None,
+        chat_name: str = None,
+        author_name: str = None,
+        is_group: bool = None,
+        is_admin: bool = False,
+        mention_ids: Iterable[int] = (),
+        reply_to_id: int = None,
+        date: datetime.datetime | str = None
+    ) -> LoopbackMessage:
+        author = self.add_user(author_id, author_name, is_admin)
+        chat = self.add_chat(chat_id, chat_name, chat_id != author_id if is_group is None else is_group)
+        if author not in chat.users:
+            chat.users.append(author)
+
+        if isinstance(date, str):
+            date = datetime.datetime.fromisoformat(date)
+
+        message = LoopbackMessage(
+            id=next(self._message_ids) if message_id is None else message_id,
+            chat=chat,
+            author=author,
+            text=text,
+            mentions=[self.add_user(mention_id) for mention_id in mention_ids],
+            reply_to=self.messages.get((chat_id, reply_to_id)),
+            date=date or datetime.datetime.now(datetime.timezone.utc)
+        )
+        self.messages[chat.id, message.id] = message
+        return message
+
+    async def delete_message(self, message: LoopbackMessage):
+        await self._wait()
+        message.is_deleted = True
+        self.messages.pop((message.chat.id, message.id), None)
+
+    async def dispatch(self, event: LoopbackMessage | LoopbackButtonEvent):
+        for callback, event_type, command_name in self._event_handlers:
+            if isinstance(event, event_type) and (command_name is None or event.command_name == command_name):
+                await callback(event)
+
+    async def edit_message(self, message: LoopbackMessage, text: str = None, media: Media = None, buttons: list[list[Button]] = None) -> LoopbackMessage:
+        await self._wait()
+        if text is not None:
+            message.text = text
+        if media is not None:
+            message.media = media
+        if buttons is not None:
+            message.buttons = buttons
+        message.edit_date = datetime.datetime.now(datetime.timezone.utc)
+        return message
+
+    async def get_me(self) -> LoopbackUser:
+        await self._wait()
+        return self.me
+
+    def press_button(self, message: LoopbackMessage, text: str, presser_id: int) -> LoopbackButtonEvent:
+        return LoopbackButtonEvent(message, text, self.add_user(presser_id))
+
+    async def send_message(
+        self,
+        chat: LoopbackChat,
+        text: str = '',
+        media: Media = None,
+        buttons: list[list[Button]] = None,
+        reply_to: LoopbackMessage = None
+    ) -> LoopbackMessage:
+        await self._wait()
+        message = LoopbackMessage(next(self._message_ids), chat, self.me, text, media, buttons, reply_to=reply_to)
+        self.messages[chat.id, message.id] = message
+        self.sent_messages.append(message)
+        return message
+
+    async def set_commands(self, commands: list[dict]):
+        await self._wait()
+        self.commands = commands
+
+
+# ---------------------------------------------------------------------------------------------------- #
+# ------------------------------------------- LOOPBACK_BOT ------------------------------------------- #
+# ---------------------------------------------------------------------------------------------------- #
+class LoopbackBot(MultiBot[LoopbackClient]):
+    event_types = (LoopbackButtonEvent, LoopbackMessage)
+
+    def __init__(
+        self,
+        client: LoopbackClient = None,
+        database: pymongo.database.Database = None,
+        owner_id: int = None,
+        send_scheduler: SendScheduler | None = None
+    ):
+        super().__init__(token='loopback', client=client or LoopbackClient(), send_scheduler=send_scheduler)
+        self.database = database
+        self.owner_id = owner_id
+
+    # -------------------------------------------------------- #
+    # ------------------- PROTECTED METHODS ------------------ #
+    # -------------------------------------------------------- #
+    def _add_handlers(self):
+        super()._add_handlers()
+        self.client.add_event_handler(self._on_button_press_raw, LoopbackButtonEvent)
+        self.client.add_event_handler(self._on_new_message_raw, LoopbackMessage)
+
+    async def _ban(self, user: int | str | User, group_: int | str | Chat | Message, message: Message = None):
+        self.client.banned.add((self.get_user_id(user), self.get_group_id(group_)))
+
+    @return_if_first_empty(exclude_self_types='LoopbackBot', globals_=globals())
+    async def _create_chat_from_loopback_chat(self, original_chat: LoopbackChat) -> Chat | None:
+        return self.Chat(
+            platform=self.platform,
+            id=original_chat.id,
+            name=original_chat.name,
+            group_id=original_chat.id if original_chat.is_group else None,
+            group_name=original_chat.name if original_chat.is_group else None,
+            original_object=original_chat
+        )
+
+    @return_if_first_empty(exclude_self_types='LoopbackBot', globals_=globals())
+    async def _create_user_from_loopback_user(self, original_user: LoopbackUser) -> User | None:
+        return self.User(
+            platform=self.platform,
+            id=original_user.id,
+            name=original_user.name,
+            is_admin=original_user.is_admin,
+            is_bot=original_user.is_bot,
+            original_object=original_user
+        )
+
+    @return_if_first_empty(exclude_self_types='LoopbackBot', globals_=globals())
+    async def _get_author(self, original_message: LoopbackMessage) -> User | None:
+        return await self._create_user_from_loopback_user(original_message.author)
+
+    @return_if_first_empty(exclude_self_types='LoopbackBot', globals_=globals())
+    async def _get_button_pressed_text(self, event: LoopbackButtonEvent | LoopbackMessage) -> str | None:
+        if isinstance(event, LoopbackButtonEvent):
+            return event.text
+
+    @return_if_first_empty(exclude_self_types='LoopbackBot', globals_=globals())
+    async def _get_button_presser_user(self, event: LoopbackButtonEvent | LoopbackMessage) -> User | None:
+        if isinstance(event, LoopbackButtonEvent):
+            return await self._create_user_from_loopback_user(event.presser)
+
+    @return_if_first_empty(exclude_self_types='LoopbackBot', globals_=globals())
+    async def _get_chat(self, original_message: LoopbackMessage) -> Chat | None:
+        return await self._create_chat_from_loopback_chat(original_message.chat)
+
+    @return_if_first_empty(exclude_self_types='LoopbackBot', globals_=globals())
+    async def _get_command_text(self, original_message: LoopbackMessage) -> str | None:
+        for registered_callback in self._registered_callbacks:
+            if (
+                registered_callback.command_name
+                and
+                (match := re.match(fr'/{registered_callback.command_name}\s*(.*)', original_message.text))
+            ):
+                return match.group(1).strip()
+
+    @return_if_first_empty(exclude_self_types='LoopbackBot', globals_=globals())
+    async def _get_date(self, original_message: LoopbackMessage) -> datetime.datetime | None:
+        return original_message.date
+
+    @return_if_first_empty(exclude_self_types='LoopbackBot', globals_=globals())
+    async def _get_edit_date(self, original_message: LoopbackMessage) -> datetime.datetime | None:
+        return original_message.edit_date
+
+    @return_if_first_empty(exclude_self_types='LoopbackBot', globals_=globals())
+    async def _get_event_chat_id(self, event: LoopbackButtonEvent | LoopbackMessage) -> int | None:
+        return (await self._get_original_message(event)).chat.id
+
+    @return_if_first_empty(exclude_self_types='LoopbackBot', globals_=globals())
+    async def _get_event_user_id(self, event: LoopbackButtonEvent | LoopbackMessage) -> int | None:
+        if isinstance(event, LoopbackButtonEvent):
+            return event.presser.id
+        return event.author.id
+
+    @return_if_first_empty(exclude_self_types='LoopbackBot', globals_=globals())
+    async def _get_is_inline(self, event: LoopbackButtonEvent | LoopbackMessage) -> bool | None:
+        return False
+
+    @return_if_first_empty(exclude_self_types='LoopbackBot', globals_=globals())
+    async def _get_mentions(self, original_message: LoopbackMessage) -> list[User]:
+        mentioned_names = set(re.findall(r'@(\w+)', original_message.text or ''))
+        mentioned_users = OrderedSet(original_message.mentions)
+        for user in original_message.chat.users:
+            if user.name in mentioned_names:
+                mentioned_users.add(user)
+
+        return [await self._create_user_from_loopback_user(user) for user in mentioned_users]
+
+    @return_if_first_empty(exclude_self_types='LoopbackBot', globals_=globals())
+    async def _get_message_id(self, original_message: LoopbackMessage) -> int | None:
+        return original_message.id
+
+    @return_if_first_empty(exclude_self_types='LoopbackBot', globals_=globals())
+    async def _get_original_message(self, event: LoopbackButtonEvent | LoopbackMessage) -> LoopbackMessage:
+        if isinstance(event, LoopbackButtonEvent):
+            return event.message
+        return event
+
+    @return_if_first_empty(exclude_self_types='LoopbackBot', globals_=globals())
+    async def _get_replied_message(self, original_message: LoopbackMessage) -> Message | None:
+        if original_message.reply_to:
+            return await self._get_message(original_message.reply_to)
+
+    @return_if_first_empty(exclude_self_types='LoopbackBot', globals_=globals())
+    async def _get_replied_message_id(self, original_message: LoopbackMessage) -> int | str | None:
+        if original_message.reply_to:
+            return original_message.reply_to.id
+
+    @return_if_first_empty(exclude_self_types='LoopbackBot', globals_=globals())
+    async def _get_text(self, original_message: LoopbackMessage) -> str:
+        return original_message.text
+
+    async def _mute(self, user: int | str | User, group_: int | str | Chat | Message, message: Message = None):
+        self.client.muted.add((self.get_user_id(user), self.get_group_id(group_)))
+
+    async def _register_commands(self) -> None:
+        commands = []
+
+        for registered_callback in self._registered_callbacks:
+            if not registered_callback.command_name:
+                continue
+
+            self.client.add_event_handler(
+                find_message(functools.partial(self._run_registered_callback, registered_callback)),
+                LoopbackMessage,
+                registered_callback.command_name
+            )
+            commands.append({'command': registered_callback.command_name, 'description': registered_callback.command_description})
+
+        await self._sync_commands(commands, functools.partial(self.client.set_commands, commands))
+
+    async def _start_async(self):
+        self._add_handlers()
+        await self._on_ready()
+
+    async def _unban(self, user: int | str | User, group_: int | str | Chat | Message, message: Message = None):
+        self.client.banned.discard((self.get_user_id(user), self.get_group_id(group_)))
+
+    async def _unmute(self, user: int | str | User, group_: int | str | Chat | Message, message: Message = None):
+        self.client.muted.discard((self.get_user_id(user), self.get_group_id(group_)))
+
+    # ---------------------------------------------- #
+    #                    HANDLERS                    #
+    # ---------------------------------------------- #
+    async def _on_ready(self):
+        if not self._is_initialized:
+            self.platform = Platform.LOOPBACK
+            with self.startup_profiler.phase('entities'):
+                me = await self.client.get_me()
+                self.id = me.id
+                self.name = me.name
+
+            with self.startup_profiler.phase('database'):
+                flanautils.init_database()
+                if self.database is not None:
+                    MongoBase.init_database_attributes(self.database)
+
+            with self.startup_profiler.phase('commands'):
+                await self._register_commands()
+
+        await super()._on_ready()
+
+    # -------------------------------------------------------- #
+    # -------------------- PUBLIC METHODS -------------------- #
+    # -------------------------------------------------------- #
+    @return_if_first_empty(exclude_self_types='LoopbackBot', globals_=globals())
+    async def clear(self, chat: int | str | Chat | Message, n_messages: int = None, until_message: Message = None):
+        if not n_messages and not until_message:
+            return
+
+        chat = await self.get_chat(chat)
+
+        query_database = {'platform': self.platform.value, 'chat': chat.object_id, 'is_deleted': False}
+        database_kwargs = {}
+        if n_messages:
+            database_kwargs['limit'] = int(n_messages)
+        if until_message:
+            query_database['date'] = {'$gte': until_message.date}
+
+        messages_to_delete: Iterator[Message] = self.Message.find(query_database, sort_keys=(('date', pymongo.DESCENDING),), lazy=True, **database_kwargs)
+
+        for message_to_delete in messages_to_delete:
+            await self.delete_message(message_to_delete, chat)
+
+    @return_if_first_empty(exclude_self_types='LoopbackBot', globals_=globals())
+    async def delete_message(
+        self,
+        message_to_delete: int | str | Message,
+        chat: int | str | Chat | Message = None,
+        raise_not_found=False
+    ):
+        if isinstance(message_to_delete, self.Message) and message_to_delete.original_object:
+            await self.client.delete_message(message_to_delete.original_object)
+        else:
+            chat = await self.get_chat(chat)
+            chat.pull_from_database()
+            if isinstance(message_to_delete, Message):
+                message_id = message_to_delete.id
+            else:
+                message_id = int(message_to_delete)
+                message_to_delete = self.Message.find_one({'platform': self.platform.value, 'id': message_id, 'chat': chat.object_id})
+
+            if original_message := self.client.messages.get((chat.id, message_id)):
+                await self.client.delete_message(original_message)
+
+        if message_to_delete:
+            message_to_delete.is_deleted = True
+            message_to_delete.save(('is_deleted',))
+
+    @return_if_first_empty(exclude_self_types='LoopbackBot', globals_=globals())
+    async def get_chat(self, chat: int | str | User | Chat | Message) -> Chat | None:
+        match chat:
+            case int(chat_id):
+                original_chat = self.client.chats.get(chat_id)
+            case str(chat_name):
+                original_chat = next((chat_ for chat_ in self.client.chats.values() if chat_.name == chat_name), None)
+            case self.User() as user:
+                original_chat = self.client.add_chat(user.id, user.name)
+            case self.Chat():
+                return chat
+            case self.Message() as message:
+                return message.chat
+            case _:
+                raise TypeError('bad arguments')
+
+        return await self._create_chat_from_loopback_chat(original_chat)
+
+    async def get_me(self, group_: int | str | Chat | Message = None) -> User | None:
+        return await self._create_user_from_loopback_user(await self.client.get_me())
+
+    @return_if_first_empty(exclude_self_types='LoopbackBot', globals_=globals())
+    async def get_message(self, message: int | str | Message, chat: int | str | User | Chat | Message) -> Message | None:
+        if not (chat := await self.get_chat(chat)):
+            return
+
+        match message:
+            case int(message_id):
+                pass
+            case str(message_id):
+                message_id = int(message_id)
+            case self.Message():
+                return message
+            case _:
+                raise TypeError('bad arguments')
+
+        if original_message := self.client.messages.get((chat.id, message_id)):
+            return await self._get_message(original_message)
+
+    @return_if_first_empty(exclude_self_types='LoopbackBot', globals_=globals())
+    async def get_user(self, user: int | str | User, group_: int | str | Chat | Message = None) -> User | None:
+        match user:
+            case int(user_id):
+                original_user = self.client.users.get(user_id)
+            case str(user_name):
+                original_user = next((user_ for user_ in self.client.users.values() if user_.name == user_name), None)
+            case self.User():
+                return user
+            case _:
+                raise TypeError('bad arguments')
+
+        return await self._create_user_from_loopback_user(original_user)
+
+    @return_if_first_empty(exclude_self_types='LoopbackBot', globals_=globals())
+    async def get_users(self, group_: int | str | Chat | Message) -> list[User]:
+        chat = await self.get_chat(group_)
+        return [await self._create_user_from_loopback_user(user) for user in chat.original_object.users]
+
+    async def is_muted(self, user: int | str | User, group_: int | str | Chat | Message) -> bool:
+        return (self.get_user_id(user), self.get_group_id(group_)) in self.client.muted
+
+    async def make_mention(self, user: int | str | User, group_: int | str | Chat | Message = None) -> str:
+        if isinstance(user, str):
+            return f'@{user}'
+
+        user = await self.get_user(user, group_)
+        return f'@{user.name}'
+
+    async def replay(
+        self,
+        events: Iterable[LoopbackMessage | LoopbackButtonEvent | dict],
+        rate: float = None,
+        concurrently=False
+    ):
+        loop = asyncio.get_running_loop()
+        start_time = loop.time()
+        tasks = []
+
+        for i, event in enumerate(events):
+            if isinstance(event, dict):
+                event = self.client.create_message(**event)
+
+            if rate and (delay := start_time + i / rate - loop.time()) > 0:
+                await asyncio.sleep(delay)
+
+            if concurrently:
+                tasks.append(asyncio.create_task(self.client.dispatch(event)))
+            else:
+                await self.client.dispatch(event)
+
+        await asyncio.gather(*tasks)
+
+    @parse_arguments
+    async def send(
+        self,
+        text='',
+        media: Media = None,
+        buttons: list[str | tuple[str, bool] | Button | list[str | tuple[str, bool] | Button]] | None = None,
+        chat: int | str | User | Chat | Message | None = None,
+        message: Message = None,
+        *,
+        buttons_key: Any = None,
+        reply_to: int | str | Message = None,
+        data: dict = None,
+        enable_link_previews: bool = True,
+        silent: bool = False,
+        send_as_file: bool = None,
+        priority: SendPriority = None,
+        raise_exceptions=False,
+        edit=False
+    ) -> Message | None:
+        if edit:
+            await self._schedule_send(
+                functools.partial(self.client.edit_message, message.original_object, text, media, buttons),
+                chat,
+                message,
+                priority
+            )
+            return await self._update_message_attributes(message, media, buttons, chat, buttons_key, data, update_edit_date=True)
+
+        if not any((text, media, buttons)):
+            return
+
+        match reply_to:
+            case int(message_id) | str(message_id):
+                reply_to = self.client.messages.get((chat.id, int(message_id)))
+            case self.Message() as message_to_reply:
+                reply_to = message_to_reply.original_object
+
+        bot_message = await self._get_message(
+            await self._schedule_send(
+                functools.partial(self.client.send_message, chat.original_object, text, media, buttons, reply_to),
+                chat,
+                message,
+                priority
+            )
+        )
+
+        return await self._update_message_attributes(bot_message, media, buttons, chat, buttons_key, data)
+
+    async def typing(self, chat: int | str | User | Chat | Message) -> contextlib.AbstractAsyncContextManager:
+        return contextlib.nullcontext()
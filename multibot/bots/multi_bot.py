@@ -9,6 +9,7 @@ __all__ = [
     'out_of_service',
     'owner',
     'parse_arguments',
+    'rate_limit',
     'reply',
     'MultiBot'
 ]
@@ -24,7 +25,7 @@ import traceback
 import types
 from abc import ABC
 from collections import defaultdict
-from collections.abc import Awaitable, Callable, Coroutine, Iterable, Iterator, Mapping, Sequence
+from collections.abc import Awaitable, Callable, Coroutine, Hashable, Iterable, Iterator, Mapping, Sequence
 from typing import Any, Generic, Literal, TypeVar, overload
 
 import flanautils
@@ -33,7 +34,7 @@ from flanautils import AmbiguityError, Media, NotFoundError, OrderedSet, ScoreMa
 
 from multibot import constants
 from multibot.exceptions import BadRoleError, LimitError, SendError, UserDisconnectedError
-from multibot.models import Ban, Button, ButtonsInfo, Chat, Message, MessagesFormat, Mute, Penalty, Platform, RegisteredCallback, Role, User
+from multibot.models import Ban, Button, ButtonsInfo, CallbackProfiler, Chat, CommandsFingerprint, Lazy, LoopWatchdog, MediaCache, MediaProcessor, Message, MessagesFormat, Metrics, Mute, Penalty, Platform, RateLimit, RateLimitScope, RateLimiter, RegisteredCallback, Role, SendPriority, SendScheduler, StartupProfiler, StoredMedia, Tracer, User
 
 
 # ---------------------------------------------------- #
@@ -44,7 +45,7 @@ def find_message(func_: Callable = None, /, return_if_not_found=False) -> Callab
     def decorator(func: Callable) -> Callable:
         @functools.wraps(func)
         async def wrapper(*args, **kwargs):
-            def take_arg(type_: type, args_, kwargs_):
+            def take_arg(type_: type | tuple, args_, kwargs_):
                 object_ = None
                 new_args = []
                 for arg in args_:
@@ -76,9 +77,14 @@ def find_message(func_: Callable = None, /, return_if_not_found=False) -> Callab
 
             message, args, kwargs = take_arg(Message, args, kwargs)
             if not message:
-                event, args, kwargs = take_arg(constants.MESSAGE_EVENT, args, kwargs)
+                event, args, kwargs = take_arg(self.event_types, args, kwargs)
                 if event:
-                    message = await self._get_message(event)
+                    if self.rate_limit and await self._is_event_rate_limited(event):
+                        await self.accept_button_event(event)
+                        return
+                    with self.tracer.span('event', platform=self.platform.name):
+                        message = await self._get_message(event)
+                        return await method(message, *args, **kwargs)
                 elif return_if_not_found:
                     return
                 else:
@@ -305,13 +311,39 @@ def parse_arguments(func: Callable) -> Callable:
     return wrapper
 
 
+@shift_args_if_called
+def rate_limit(
+    func_: Callable = None,
+    /,
+    times: int = 1,
+    seconds: int | float | datetime.timedelta = 1,
+    scope: RateLimitScope = RateLimitScope.USER
+) -> Callable:
+    def decorator(func: Callable) -> Callable:
+        rate_limit_ = RateLimit(times, seconds, scope)
+
+        @functools.wraps(func)
+        @find_message
+        async def wrapper(self: MultiBot, message: Message, *args, **kwargs):
+            if not await self._is_rate_limited(func, rate_limit_, message):
+                return await func(self, message, *args, **kwargs)
+            await self.accept_button_event(message)
+
+        return wrapper
+
+    return decorator(func_) if func_ else decorator
+
+
 @shift_args_if_called
 def reply(func_: Callable = None, /, is_=True) -> Callable:
     def decorator(func: Callable) -> Callable:
         @functools.wraps(func)
         @find_message
         async def wrapper(self: MultiBot, message: Message, *args, **kwargs):
-            if is_ is bool(message.replied_message):
+            is_reply = message.replied_message_id is not None or bool(message.replied_message)
+            if is_reply and is_:
+                is_reply = bool(await self.get_replied_message(message))
+            if is_ is is_reply:
                 return await func(self, message, *args, **kwargs)
             await self.accept_button_event(message)
 
@@ -324,14 +356,24 @@ def reply(func_: Callable = None, /, is_=True) -> Callable:
 # --------------------------------------------- MULTI_BOT --------------------------------------------- #
 # ----------------------------------------------------------------------------------------------------- #
 T = TypeVar('T')
+T_Result = TypeVar('T_Result')
 
 
 class MultiBot(Generic[T], ABC):
     Chat = Chat
     Message = Message
     User = User
-
-    def __init__(self, token: str, client: T, message_max_characters: int | None = None):
+    event_types: tuple[type, ...] = ()
+    blob_store = StoredMedia.blob_store
+    callback_profiler = CallbackProfiler()
+    loop_watchdog = LoopWatchdog()
+    media_cache = MediaCache()
+    media_processor = MediaProcessor(media_cache)
+    metrics = Metrics()
+    startup_profiler = StartupProfiler()
+    tracer = Tracer()
+
+    def __init__(self, token: str, client: T, message_max_characters: int | None = None, send_scheduler: SendScheduler | None = None):
         self.platform: Platform | None = None
         self.id: int | None = None
         self.name: str | None = None
@@ -346,6 +388,11 @@ class MultiBot(Generic[T], ABC):
         MessageType: type = self.Message
         self._message_cache: dict[tuple[int, int], MessageType] = {}
         self._message_max_characters = message_max_characters
+        self.rate_limit: RateLimit | None = None
+        self._rate_limiter = RateLimiter()
+        self._rate_limited_events: dict[int, tuple[constants.MESSAGE_EVENT, bool]] = {}
+        self.send_scheduler = send_scheduler
+        self.startup_profiler.add_phase('import', self.startup_profiler.start_time)
 
     # -------------------------------------------------------- #
     # ------------------- PROTECTED METHODS ------------------ #
@@ -366,6 +413,13 @@ class MultiBot(Generic[T], ABC):
                 except (PermissionError, UserDisconnectedError):
                     pass
 
+    def _find_stored_message(self, message_id: int | str, chat: Chat) -> Message | None:
+        try:
+            return self._message_cache[message_id, chat.id]
+        except KeyError:
+            chat.pull_from_database()
+            return self.Message.find_one({'platform': self.platform.value, 'id': message_id, 'chat': chat._id})
+
     async def _find_users_to_punish(self, message: Message) -> OrderedSet[User]:
         bot_user = await self.get_me(message.chat.group_id)
         users: OrderedSet[User] = OrderedSet(message.mentions)
@@ -408,10 +462,22 @@ class MultiBot(Generic[T], ABC):
     async def _get_edit_date(self, original_message: constants.ORIGINAL_MESSAGE) -> datetime.datetime | None:
         pass
 
+    @return_if_first_empty(exclude_self_types='MultiBot', globals_=globals())
+    async def _get_event_chat_id(self, event: constants.MESSAGE_EVENT) -> int | str | None:
+        pass
+
+    @return_if_first_empty(exclude_self_types='MultiBot', globals_=globals())
+    async def _get_event_user_id(self, event: constants.MESSAGE_EVENT) -> int | str | None:
+        pass
+
     @return_if_first_empty(exclude_self_types='MultiBot', globals_=globals())
     async def _get_is_inline(self, event: constants.MESSAGE_EVENT) -> bool | None:
         pass
 
+    async def _get_lazy_replied_message(self, original_message: constants.ORIGINAL_MESSAGE, replied_message_id: int | str | None, chat: Chat) -> Message | Lazy | None:
+        if replied_message_id is not None:
+            return Lazy(self._find_stored_message, replied_message_id, chat)
+
     @return_if_first_empty(exclude_self_types='MultiBot', globals_=globals())
     async def _get_mentions(self, original_message: constants.ORIGINAL_MESSAGE) -> list[User]:
         pass
@@ -422,41 +488,51 @@ class MultiBot(Generic[T], ABC):
         event: constants.MESSAGE_EVENT,
         pull_overwrite_fields: Iterable[str] = ('_id', 'date')
     ) -> Message:
-        original_message = await self._get_original_message(event)  # todo usar event en vez de original_message y raw_event para el otro?
-
-        message_id = await self._get_message_id(original_message)
-        chat = await self._get_chat(original_message)
-        try:
-            cached_message = self._message_cache[message_id, chat.id]
-        except KeyError:
-            message = self.Message(
-                platform=self.platform,
-                id=message_id,
-                author=await self._get_author(original_message),
-                text=await self._get_text(original_message),
-                command_text=(command_text := await self._get_command_text(original_message)),
-                mentions=await self._get_mentions(original_message),
-                date=await self._get_date(original_message),
-                chat=chat,
-                replied_message=await self._get_replied_message(original_message),
-                is_command=command_text is not None,
-                is_inline=await self._get_is_inline(event),
-                original_object=original_message,
-                original_event=event
-            )
-            message.resolve()
-            message.update_edit_date(await self._get_edit_date(original_message))
-            message.save(pull_overwrite_fields=pull_overwrite_fields, pull_lazy=False)
-            self._message_cache[message_id, chat.id] = message
-            return message
-
-        if cached_message.buttons_info:
-            cached_message.buttons_info.pressed_text = await self._get_button_pressed_text(event)
-            cached_message.buttons_info.presser_user = await self._get_button_presser_user(event)
-        cached_message.update_edit_date(await self._get_edit_date(original_message))
-        cached_message.original_object = original_message
-        cached_message.original_event = event
-        return cached_message
+        with (
+            self.metrics.time('multibot_get_message_seconds', platform=self.platform.name),
+            self.tracer.span('_get_message')
+        ):
+            original_message = await self.tracer.trace('_get_original_message', self._get_original_message(event))  # todo usar event en vez de original_message y raw_event para el otro?
+
+            message_id = await self.tracer.trace('_get_message_id', self._get_message_id(original_message))
+            chat = await self.tracer.trace('_get_chat', self._get_chat(original_message))
+            self.tracer.set_attributes(chat_id=chat.id if chat else None, message_id=message_id)
+            try:
+                cached_message = self._message_cache[message_id, chat.id]
+            except KeyError:
+                self.metrics.increment('multibot_message_cache_total', platform=self.platform.name, result='miss')
+                message = self.Message(
+                    platform=self.platform,
+                    id=message_id,
+                    author=await self.tracer.trace('_get_author', self._get_author(original_message)),
+                    text=await self.tracer.trace('_get_text', self._get_text(original_message)),
+                    command_text=(command_text := await self.tracer.trace('_get_command_text', self._get_command_text(original_message))),
+                    mentions=await self.tracer.trace('_get_mentions', self._get_mentions(original_message)),
+                    date=await self.tracer.trace('_get_date', self._get_date(original_message)),
+                    chat=chat,
+                    replied_message_id=(replied_message_id := await self.tracer.trace('_get_replied_message_id', self._get_replied_message_id(original_message))),
+                    replied_message=await self.tracer.trace('_get_lazy_replied_message', self._get_lazy_replied_message(original_message, replied_message_id, chat)),
+                    is_command=command_text is not None,
+                    is_inline=await self.tracer.trace('_get_is_inline', self._get_is_inline(event)),
+                    original_object=original_message,
+                    original_event=event
+                )
+                message.resolve()
+                message.update_edit_date(await self.tracer.trace('_get_edit_date', self._get_edit_date(original_message)))
+                with self.tracer.span('save'):
+                    message.save(pull_overwrite_fields=pull_overwrite_fields, pull_lazy=False)
+                self._message_cache[message_id, chat.id] = message
+                self.metrics.set('multibot_message_cache_size', len(self._message_cache), platform=self.platform.name)
+                return message
+
+            self.metrics.increment('multibot_message_cache_total', platform=self.platform.name, result='hit')
+            if cached_message.buttons_info:
+                cached_message.buttons_info.pressed_text = await self.tracer.trace('_get_button_pressed_text', self._get_button_pressed_text(event))
+                cached_message.buttons_info.presser_user = await self.tracer.trace('_get_button_presser_user', self._get_button_presser_user(event))
+            cached_message.update_edit_date(await self.tracer.trace('_get_edit_date', self._get_edit_date(original_message)))
+            cached_message.original_object = original_message
+            cached_message.original_event = event
+            return cached_message
 
     @return_if_first_empty(exclude_self_types='MultiBot', globals_=globals())
     async def _get_message_id(self, original_message: constants.ORIGINAL_MESSAGE) -> int | str | None:
@@ -470,10 +546,45 @@ class MultiBot(Generic[T], ABC):
     async def _get_replied_message(self, original_message: constants.ORIGINAL_MESSAGE) -> Message | None:
         pass
 
+    @return_if_first_empty(exclude_self_types='MultiBot', globals_=globals())
+    async def _get_replied_message_id(self, original_message: constants.ORIGINAL_MESSAGE) -> int | str | None:
+        pass
+
+    def _get_retry_after(self, exception: Exception) -> int | float | None:
+        pass
+
     @return_if_first_empty(exclude_self_types='MultiBot', globals_=globals())
     async def _get_text(self, original_message: constants.ORIGINAL_MESSAGE) -> str:
         pass
 
+    async def _is_event_rate_limited(self, event: constants.MESSAGE_EVENT) -> bool:
+        try:
+            return self._rate_limited_events[id(event)][1]
+        except KeyError:
+            pass
+
+        is_rate_limited = await self._is_rate_limited(None, self.rate_limit, event)
+
+        self._rate_limited_events[id(event)] = (event, is_rate_limited)  # the event is kept to prevent its id from being reused
+        if len(self._rate_limited_events) > constants.RATE_LIMITED_EVENTS_MEMORY:
+            del self._rate_limited_events[next(iter(self._rate_limited_events))]
+
+        return is_rate_limited
+
+    async def _is_rate_limited(self, key: Hashable, rate_limit: RateLimit, message_or_event: constants.MESSAGE_EVENT | Message) -> bool:
+        match message_or_event:
+            case self.Message() as message:
+                if message.buttons_info and message.buttons_info.presser_user:
+                    user_id = message.buttons_info.presser_user.id
+                else:
+                    user_id = message.author.id if message.author else None
+                chat_id = message.chat.id if message.chat else None
+            case event:
+                user_id = await self._get_event_user_id(event)
+                chat_id = await self._get_event_chat_id(event)
+
+        return not self._rate_limiter.consume(key, rate_limit, user_id, chat_id)
+
     @return_if_first_empty(exclude_self_types='MultiBot', globals_=globals())
     async def _manage_exceptions(
         self,
@@ -486,6 +597,7 @@ class MultiBot(Generic[T], ABC):
             exceptions = (exceptions,)
 
         for exception in exceptions:
+            self.metrics.increment('multibot_exceptions_total', platform=self.platform.name, type=type(exception).__name__)
             # noinspection PyBroadException
             try:
                 raise exception
@@ -595,12 +707,56 @@ class MultiBot(Generic[T], ABC):
             penalty.pull_from_database()
             penalty.delete()
 
+    async def _run_registered_callback(self, message: Message, registered_callback: RegisteredCallback):
+        if registered_callback.rate_limit and await self._is_rate_limited(registered_callback.callback, registered_callback.rate_limit, message):
+            await self.accept_button_event(message)
+            return
+
+        name = getattr(registered_callback.callback, '__qualname__', repr(registered_callback.callback))
+        with (
+            self.loop_watchdog.activity(name, self.platform.name, message.chat.id if message.chat else None, message.id),
+            self.metrics.time('multibot_callback_seconds', platform=self.platform.name, callback=name),
+            self.tracer.span('callback', callback=name)
+        ):
+            await self.callback_profiler.profile(name, registered_callback(message, *registered_callback.extra_args, **registered_callback.extra_kwargs))
+
+    async def _schedule_send(
+        self,
+        send_function: Callable[[], Awaitable[T_Result]],
+        chat: Chat = None,
+        message: Message = None,
+        priority: SendPriority = None
+    ) -> T_Result:
+        if priority is None:
+            priority = SendPriority.INTERACTIVE if message else SendPriority.NORMAL
+
+        with (
+            self.metrics.time('multibot_send_seconds', platform=self.platform.name, priority=priority.name),
+            self.tracer.span('send', platform=self.platform.name, chat_id=chat.id if chat else None, priority=priority.name)
+        ):
+            if not self.send_scheduler:
+                return await send_function()
+
+            return await self.send_scheduler.send(send_function, chat.id if chat else None, priority)
+
     async def _start_async(self):
         pass
 
     def _start_sync(self):
         asyncio.run(self._start_async())
 
+    async def _sync_commands(self, commands_data: Any, sync_function: Callable[[], Awaitable]):
+        with self.startup_profiler.phase('database'):
+            flanautils.init_database()
+
+        commands_fingerprint = CommandsFingerprint(self.platform, self.id, CommandsFingerprint.hash(commands_data))
+        stored_commands_fingerprint = CommandsFingerprint.find_one({'platform': self.platform.value, 'bot_id': self.id})
+        if stored_commands_fingerprint and stored_commands_fingerprint.fingerprint == commands_fingerprint.fingerprint:
+            return
+
+        await sync_function()
+        commands_fingerprint.save()
+
     async def _unban(self, user: int | str | User, group_: int | str | Chat | Message, message: Message = None):
         pass
 
@@ -611,7 +767,7 @@ class MultiBot(Generic[T], ABC):
         if penalty.time and penalty.time <= constants.TIME_THRESHOLD_TO_MANUAL_UNPENALIZE:
             flanautils.do_later(penalty.time, self._remove_penalty, penalty, unpenalize_method, message)
 
-    def _update_message_attributes(
+    async def _update_message_attributes(
         self,
         message: Message,
         media: Media = None,
@@ -621,30 +777,24 @@ class MultiBot(Generic[T], ABC):
         data: dict = None,
         update_edit_date=False
     ):
-        if media is not None:
-            if len(bytes(media)) <= constants.PYMONGO_MEDIA_MAX_BYTES:
-                message.medias = [media]
-            else:
-                empty_media = Media.from_dict({k: v for k, v in media.to_dict().items() if k not in ('bytes_', 'song_info')})
-                if media.song_info:
-                    empty_song_info = Media.from_dict({k: v for k, v in media.song_info.to_dict().items() if k != 'bytes_'})
-                    empty_media.song_info = empty_song_info
-                message.medias = [empty_media]
-        try:
-            if buttons is not None:
-                self._message_cache[message.id, chat.id].buttons_info.buttons = buttons
-            if buttons_key is not None:
-                self._message_cache[message.id, chat.id].buttons_info.key = buttons_key
-        except (AttributeError, KeyError):
-            message.buttons_info = ButtonsInfo(buttons=buttons, key=buttons_key)
-        if data is not None:
-            message.data = data
-        if message.buttons_info or message.data is not None:
-            self._message_cache[message.id, chat.id] = message
-
-        if update_edit_date:
-            message.update_edit_date(datetime.datetime.now(datetime.timezone.utc))
-        message.save()
+        with self.tracer.span('_update_message_attributes', message_id=message.id):
+            if media is not None:
+                message.medias = [await self.blob_store.store_media(media)]
+            try:
+                if buttons is not None:
+                    self._message_cache[message.id, chat.id].buttons_info.buttons = buttons
+                if buttons_key is not None:
+                    self._message_cache[message.id, chat.id].buttons_info.key = buttons_key
+            except (AttributeError, KeyError):
+                message.buttons_info = ButtonsInfo(buttons=buttons, key=buttons_key)
+            if data is not None:
+                message.data = data
+            if message.buttons_info or message.data is not None:
+                self._message_cache[message.id, chat.id] = message
+
+            if update_edit_date:
+                message.update_edit_date(datetime.datetime.now(datetime.timezone.utc))
+            message.save()
 
         return message
 
@@ -658,7 +808,7 @@ class MultiBot(Generic[T], ABC):
 
         for registered_callback in self._registered_button_callbacks[message.buttons_info.key]:
             try:
-                await registered_callback(message, *registered_callback.extra_args, **registered_callback.extra_kwargs)
+                await self._run_registered_callback(message, registered_callback)
             except Exception as e:
                 await self._manage_exceptions(e, message, reraise=True)
 
@@ -669,11 +819,19 @@ class MultiBot(Generic[T], ABC):
         whitelist_callbacks: set[RegisteredCallback] | None = None,
         blacklist_callbacks: set[RegisteredCallback] | None = None
     ):
+        self.startup_profiler.finish()
+        self.metrics.increment('multibot_messages_total', platform=self.platform.name)
+
         try:
-            registered_callbacks = self._parse_callbacks(message, self._registered_callbacks)
+            with (
+                self.metrics.time('multibot_parse_callbacks_seconds', platform=self.platform.name),
+                self.tracer.span('_parse_callbacks')
+            ):
+                registered_callbacks = self._parse_callbacks(message, self._registered_callbacks)
         except AmbiguityError as e:
             await self._manage_exceptions(e, message, reraise=True)
         else:
+            self.metrics.increment('multibot_callbacks_matched_total', len(registered_callbacks), platform=self.platform.name)
             for registered_callback in registered_callbacks:
                 if (
                     whitelist_callbacks is not None and registered_callback not in whitelist_callbacks
@@ -683,7 +841,7 @@ class MultiBot(Generic[T], ABC):
                     continue
 
                 try:
-                    await registered_callback(message, *registered_callback.extra_args, **registered_callback.extra_kwargs)
+                    await self._run_registered_callback(message, registered_callback)
                 except Exception as e:
                     await self._manage_exceptions(e, message, reraise=True)
 
@@ -691,11 +849,19 @@ class MultiBot(Generic[T], ABC):
         if not self._is_initialized:
             self._is_initialized = True
             constants.load_environment()
-            flanautils.init_database()
+            with self.startup_profiler.phase('database'):
+                flanautils.init_database()
             flanautils.do_every(constants.CHECK_OLD_CACHE_MESSAGES_EVERY_SECONDS, self.check_old_cache_messages)
-            flanautils.do_every(constants.CHECK_OLD_DATABASE_MESSAGES_EVERY_SECONDS, self.check_old_database_messages)
-            flanautils.do_every(constants.CHECK_PENALTIES_EVERY_SECONDS, self.check_bans)
-            flanautils.do_every(constants.CHECK_PENALTIES_EVERY_SECONDS, self.check_mutes)
+            flanautils.do_every(constants.CHECK_OLD_RATE_LIMIT_BUCKETS_EVERY_SECONDS, self._rate_limiter.check_old_buckets)
+            if self.send_scheduler:
+                flanautils.do_every(constants.CHECK_OLD_RATE_LIMIT_BUCKETS_EVERY_SECONDS, self.send_scheduler.check_old_buckets)
+            if self.is_main_instance:
+                flanautils.do_every(constants.CHECK_OLD_DATABASE_MESSAGES_EVERY_SECONDS, self.check_old_database_messages)
+                flanautils.do_every(constants.CHECK_OLD_DATABASE_MESSAGES_EVERY_SECONDS, self.check_old_blobs)
+                flanautils.do_every(constants.CHECK_PENALTIES_EVERY_SECONDS, self.check_bans)
+                flanautils.do_every(constants.CHECK_PENALTIES_EVERY_SECONDS, self.check_mutes)
+            self.loop_watchdog.start(self.metrics)
+            self.startup_profiler.mark('ready')
 
         print(f'{self.name} activado en {self.platform.name} (id: {self.id})')
 
@@ -732,6 +898,10 @@ class MultiBot(Generic[T], ABC):
         for key in keys_to_delete:
             del self._message_cache[key]
 
+    async def check_old_blobs(self):
+        before_date = datetime.datetime.now(datetime.timezone.utc) - constants.DATABASE_MESSAGE_EXPIRATION_TIME
+        await self.blob_store.delete_unreferenced(before_date)
+
     def check_old_database_messages(self):
         before_date = datetime.datetime.now(datetime.timezone.utc) - constants.DATABASE_MESSAGE_EXPIRATION_TIME
         self.Message.delete_many_raw({'platform': self.platform.value, 'date': {'$lte': before_date}})
@@ -1083,6 +1253,15 @@ class MultiBot(Generic[T], ABC):
     async def get_message(self, message: int | str | Message, chat: int | str | User | Chat | Message) -> Message | None:
         pass
 
+    async def get_replied_message(self, message: Message) -> Message | None:
+        if not message.replied_message and message.replied_message_id is not None:
+            if message.original_object:
+                message.replied_message = await self._get_replied_message(message.original_object)
+            if not message.replied_message:
+                message.replied_message = await self.get_message(message.replied_message_id, message.chat)
+
+        return message.replied_message
+
     @return_if_first_empty(exclude_self_types='MultiBot', globals_=globals())
     async def get_user(self, user: int | str | User, group_: int | str | Chat | Message = None) -> User | None:
         pass
@@ -1131,6 +1310,10 @@ class MultiBot(Generic[T], ABC):
     async def is_deaf(self, user: int | str | User, group_: int | str | Chat | Message) -> bool:
         pass
 
+    @property
+    def is_main_instance(self) -> bool:
+        return True
+
     async def is_muted(self, user: int | str | User, group_: int | str | Chat | Message) -> bool:
         pass
 
@@ -1157,33 +1340,33 @@ class MultiBot(Generic[T], ABC):
         return self._owner_chat
 
     @overload
-    def register(self, func_: Callable = None, extra_args: Iterable = (), extra_kwargs: Mapping = None, command_name: str | None = None, command_description: str | None = None, keywords: str | Iterable[str | Iterable[str]] = (), priority: int | float = 1, min_score=constants.PARSER_MIN_SCORE_DEFAULT, always=False, default=False):
+    def register(self, func_: Callable = None, extra_args: Iterable = (), extra_kwargs: Mapping = None, command_name: str | None = None, command_description: str | None = None, keywords: str | Iterable[str | Iterable[str]] = (), priority: int | float = 1, min_score=constants.PARSER_MIN_SCORE_DEFAULT, always=False, default=False, rate_limit: RateLimit | tuple[int, int | float | datetime.timedelta] | None = None):
         pass
 
     @overload
-    def register(self, extra_args: Iterable = (), extra_kwargs: Mapping = None, command_name: str | None = None, command_description: str | None = None, keywords: str | Iterable[str | Iterable[str]] = (), priority: int | float = 1, min_score=constants.PARSER_MIN_SCORE_DEFAULT, always=False, default=False):
+    def register(self, extra_args: Iterable = (), extra_kwargs: Mapping = None, command_name: str | None = None, command_description: str | None = None, keywords: str | Iterable[str | Iterable[str]] = (), priority: int | float = 1, min_score=constants.PARSER_MIN_SCORE_DEFAULT, always=False, default=False, rate_limit: RateLimit | tuple[int, int | float | datetime.timedelta] | None = None):
         pass
 
     @shift_args_if_called(n_positions=5, exclude_self_types='MultiBot', globals_=globals())
-    def register(self, func_: Callable = None, extra_args: Iterable = (), extra_kwargs: Mapping = None, command_name: str | None = None, command_description: str | None = None, keywords: str | Iterable[str | Iterable[str]] = (), priority: int | float = 1, min_score=constants.PARSER_MIN_SCORE_DEFAULT, always=False, default=False):
+    def register(self, func_: Callable = None, extra_args: Iterable = (), extra_kwargs: Mapping = None, command_name: str | None = None, command_description: str | None = None, keywords: str | Iterable[str | Iterable[str]] = (), priority: int | float = 1, min_score=constants.PARSER_MIN_SCORE_DEFAULT, always=False, default=False, rate_limit: RateLimit | tuple[int, int | float | datetime.timedelta] | None = None):
         def decorator(func: Callable):
-            self._registered_callbacks.append(RegisteredCallback(func, extra_args, extra_kwargs, command_name, command_description, keywords, priority, min_score, always, default))
+            self._registered_callbacks.append(RegisteredCallback(func, extra_args, extra_kwargs, command_name, command_description, keywords, priority, min_score, always, default, rate_limit))
             return func
 
         return decorator(func_) if func_ else decorator
 
     @overload
-    def register_button(self, func_: Callable = None, extra_args: Iterable = (), extra_kwargs: Mapping = None, key: Any = None):
+    def register_button(self, func_: Callable = None, extra_args: Iterable = (), extra_kwargs: Mapping = None, key: Any = None, rate_limit: RateLimit | tuple[int, int | float | datetime.timedelta] | None = None):
         pass
 
     @overload
-    def register_button(self, extra_args: Iterable = (), extra_kwargs: Mapping = None, key: Any = None):
+    def register_button(self, extra_args: Iterable = (), extra_kwargs: Mapping = None, key: Any = None, rate_limit: RateLimit | tuple[int, int | float | datetime.timedelta] | None = None):
         pass
 
     @shift_args_if_called(n_positions=3, exclude_self_types='MultiBot', globals_=globals())
-    def register_button(self, func_: Callable = None, extra_args: Iterable = (), extra_kwargs: Mapping = None, key: Any = None):
+    def register_button(self, func_: Callable = None, extra_args: Iterable = (), extra_kwargs: Mapping = None, key: Any = None, rate_limit: RateLimit | tuple[int, int | float | datetime.timedelta] | None = None):
         def decorator(func: Callable):
-            self._registered_button_callbacks[key].append(RegisteredCallback(func, extra_args, extra_kwargs))
+            self._registered_button_callbacks[key].append(RegisteredCallback(func, extra_args, extra_kwargs, rate_limit=rate_limit))
             return func
 
         return decorator(func_) if func_ else decorator
@@ -1206,6 +1389,7 @@ class MultiBot(Generic[T], ABC):
         enable_link_previews: bool = True,
         silent: bool = False,
         send_as_file: bool = None,
+        priority: SendPriority = None,
         raise_exceptions=False,
         edit=False
     ) -> Message | None:
@@ -6,9 +6,11 @@ import datetime
 import functools
 import io
 import pathlib
+import random
 import re
 import struct
-from collections.abc import Coroutine
+from collections import OrderedDict
+from collections.abc import Awaitable, Coroutine, Iterable
 from typing import Any, Callable, Sequence
 
 import flanautils
@@ -17,6 +19,7 @@ import telethon
 import telethon.hints
 import telethon.tl.functions.bots
 import telethon.tl.types
+import telethon.utils
 from flanautils import Media, MediaType, OrderedSet, ResponseError, Source, return_if_first_empty, shift_args_if_called
 from telethon import TelegramClient
 from telethon.sessions import StringSession
@@ -24,7 +27,7 @@ from telethon.sessions import StringSession
 from multibot import constants
 from multibot.bots.multi_bot import MultiBot, find_message, inline, parse_arguments
 from multibot.exceptions import LimitError
-from multibot.models import Button, Chat, Message, Platform, User
+from multibot.models import Button, Chat, MediaCache, Message, Platform, ReconnectMetrics, SendPriority, SendScheduler, StoredMedia, User
 
 
 # ---------------------------------------------------- #
@@ -61,6 +64,8 @@ def user_client(func_: Callable = None, /, is_=True) -> Callable:
 # ------------------------------------------- TELEGRAM_BOT ------------------------------------------- #
 # ---------------------------------------------------------------------------------------------------- #
 class TelegramBot(MultiBot[TelegramClient]):
+    event_types = (constants.TELEGRAM_EVENT, constants.TELEGRAM_MESSAGE)
+
     def __init__(self, api_id: int | str, api_hash: int | str, bot_token: str = None, bot_session: str = None, phone: int | str = None, user_session: str = None):
         self.api_id = api_id
         self.api_hash = api_hash
@@ -85,8 +90,17 @@ class TelegramBot(MultiBot[TelegramClient]):
         super().__init__(
             token=bot_token,
             client=client,
-            message_max_characters=constants.TELEGRAM_MESSAGE_MAX_CHARACTERS
+            message_max_characters=constants.TELEGRAM_MESSAGE_MAX_CHARACTERS,
+            send_scheduler=SendScheduler(
+                constants.TELEGRAM_SEND_GLOBAL_TIMES,
+                constants.TELEGRAM_SEND_GLOBAL_SECONDS,
+                constants.TELEGRAM_SEND_CHAT_TIMES,
+                constants.TELEGRAM_SEND_CHAT_SECONDS,
+                get_retry_after=self._get_retry_after
+            )
         )
+        self.reconnect_metrics = ReconnectMetrics()
+        self._uploaded_files: OrderedDict[tuple[str, bool], telethon.types.InputPhoto | telethon.types.InputDocument] = OrderedDict()
 
     # -------------------------------------------------------- #
     # ------------------- PROTECTED METHODS ------------------ #
@@ -98,6 +112,15 @@ class TelegramBot(MultiBot[TelegramClient]):
         self.client.add_event_handler(self._on_inline_query_raw, telethon.events.InlineQuery)
         self.client.add_event_handler(self._on_new_message_raw, telethon.events.NewMessage)
 
+    def _add_uploaded_file(self, key: tuple[str, bool] | None, input_file: telethon.types.InputPhoto | telethon.types.InputDocument | None):
+        if not key or not input_file:
+            return
+
+        self._uploaded_files[key] = input_file
+        self._uploaded_files.move_to_end(key)
+        while len(self._uploaded_files) > constants.TELEGRAM_UPLOADED_FILES_CACHE_SIZE:
+            self._uploaded_files.popitem(last=False)
+
     async def _ban(self, user: int | str | User, group_: int | str | Chat | Message, message: Message = None):
         user = await self.get_user(user, group_)
         chat = await self.get_chat(group_)
@@ -192,6 +215,14 @@ class TelegramBot(MultiBot[TelegramClient]):
 
         return ''
 
+    @return_if_first_empty(exclude_self_types='TelegramBot', globals_=globals())
+    async def _get_event_chat_id(self, event: constants.TELEGRAM_EVENT | constants.TELEGRAM_MESSAGE) -> int | None:
+        return event.chat_id
+
+    @return_if_first_empty(exclude_self_types='TelegramBot', globals_=globals())
+    async def _get_event_user_id(self, event: constants.TELEGRAM_EVENT | constants.TELEGRAM_MESSAGE) -> int | None:
+        return event.sender_id
+
     @return_if_first_empty(exclude_self_types='TelegramBot', globals_=globals())
     async def _get_is_inline(self, event: constants.TELEGRAM_EVENT | constants.TELEGRAM_MESSAGE) -> bool | None:
         return isinstance(event, constants.TELEGRAM_INLINE_EVENT)
@@ -203,12 +234,18 @@ class TelegramBot(MultiBot[TelegramClient]):
 
         mentions = OrderedSet()
 
-        if replied_message := await self._get_replied_message(original_message):
-            mentions.add(replied_message.author)
-
         text = await self._get_text(original_message)
         chat = await self._get_chat(original_message)
 
+        if (replied_message_id := await self._get_replied_message_id(original_message)) is not None:
+            if replied_message := self._find_stored_message(replied_message_id, chat):
+                mentions.add(replied_message.author)
+            else:
+                try:
+                    mentions.add(await self._get_author(await original_message.get_reply_message()))
+                except (AttributeError, telethon.errors.rpcerrorlist.BotMethodInvalidError):
+                    pass
+
         for entity in original_message.entities or ():
             if not isinstance(entity, telethon.tl.types.MessageEntityMention):
                 continue
@@ -250,18 +287,59 @@ class TelegramBot(MultiBot[TelegramClient]):
 
     @return_if_first_empty(exclude_self_types='TelegramBot', globals_=globals())
     async def _get_replied_message(self, original_message: constants.TELEGRAM_EVENT | constants.TELEGRAM_MESSAGE) -> Message | None:
+        if (
+            (replied_message_id := await self._get_replied_message_id(original_message)) is not None
+            and
+            (replied_message := self._find_stored_message(replied_message_id, await self._get_chat(original_message)))
+        ):
+            return replied_message
+
         try:
             return await self._get_message(await original_message.get_reply_message())
         except (AttributeError, telethon.errors.rpcerrorlist.BotMethodInvalidError):
             pass
 
+    @return_if_first_empty(exclude_self_types='TelegramBot', globals_=globals())
+    async def _get_replied_message_id(self, original_message: constants.TELEGRAM_EVENT | constants.TELEGRAM_MESSAGE) -> int | str | None:
+        try:
+            return original_message.reply_to_msg_id
+        except AttributeError:
+            pass
+
+    def _get_retry_after(self, exception: Exception) -> int | float | None:
+        if isinstance(exception, telethon.errors.FloodWaitError | telethon.errors.SlowModeWaitError):
+            return exception.seconds
+
+    @staticmethod
+    def _get_uploaded_file(original_message: constants.TELEGRAM_MESSAGE) -> telethon.types.InputPhoto | telethon.types.InputDocument | None:
+        if original_message.photo:
+            return telethon.utils.get_input_photo(original_message.photo)
+        elif original_message.document:
+            return telethon.utils.get_input_document(original_message.document)
+
+    @staticmethod
+    async def _get_uploaded_file_key(media: Media | None, force_document=False) -> tuple[str, bool] | None:
+        if not media:
+            return
+
+        if isinstance(media, StoredMedia) and media.blob_id:
+            return media.blob_id, force_document
+        elif media.bytes_:
+            bytes_, content_hash = getattr(media, '_bytes_hash', (None, None))
+            if bytes_ is not media.bytes_:
+                content_hash = await asyncio.to_thread(MediaCache.hash, media.bytes_)
+                media._bytes_hash = (media.bytes_, content_hash)
+            return content_hash, force_document
+        elif media.url and not pathlib.Path(media.url).is_file():
+            return media.url, force_document
+
     @return_if_first_empty(exclude_self_types='TelegramBot', globals_=globals())
     async def _get_text(self, original_message: constants.TELEGRAM_EVENT | constants.TELEGRAM_MESSAGE) -> str:
         return original_message.text
 
-    @staticmethod
-    @return_if_first_empty
+    @return_if_first_empty(exclude_self_types='TelegramBot', globals_=globals())
     async def _prepare_media_to_send(
+        self,
         media: Media,
         prefer_bytes=False,
         is_inline=False,
@@ -276,26 +354,26 @@ class TelegramBot(MultiBot[TelegramClient]):
             else:
                 return media.url
 
-        async def bytes_file() -> io.BytesIO | None:
-            if not media.bytes_:
+        async def bytes_file() -> io.BytesIO | io.FileIO | None:
+            if not (input_file := await media.load_bytes() if isinstance(media, StoredMedia) else media.bytes_):
                 try:
-                    result = await flanautils.get_request(media.url)
+                    input_file = await self.media_cache.fetch_file(media.url)
                 except ResponseError:
                     if raise_exceptions:
                         raise
                     return
-                if not isinstance(result, bytes):
-                    return
-                media.bytes_ = result
 
-            bytes_ = media.bytes_
             file_stem = media.title or 'bot_media'
             if media.title or is_inline:
                 try:
-                    bytes_ = await flanautils.edit_metadata(bytes_, {'title': file_stem}, overwrite=False)
+                    input_file = await self.media_processor.edit_metadata(input_file, {'title': file_stem}, overwrite=False)
                 except FileNotFoundError:
                     pass
-            file_ = io.BytesIO(bytes_)
+
+            if isinstance(input_file, bytes):
+                file_ = io.BytesIO(input_file)
+            else:
+                file_ = await asyncio.to_thread(io.FileIO, input_file)
             file_.name = f"{file_stem}{f'.{media.extension}' if media.extension else ''}"
             return file_
 
@@ -314,49 +392,51 @@ class TelegramBot(MultiBot[TelegramClient]):
                 continue
 
             self.client.add_event_handler(
-                find_message(
-                    functools.partial(
-                        registered_callback.callback,
-                        *registered_callback.extra_args,
-                        **registered_callback.extra_kwargs
-                    )
-                ),
+                find_message(functools.partial(self._run_registered_callback, registered_callback)),
                 telethon.events.NewMessage(pattern=f'/{registered_callback.command_name}')
             )
             commands.append(
                 telethon.tl.types.BotCommand(registered_callback.command_name, registered_callback.command_description)
             )
 
-        await self.client(
-            telethon.tl.functions.bots.SetBotCommandsRequest(
-                telethon.tl.types.BotCommandScopeDefault(), lang_code='', commands=commands
+        await self._sync_commands(
+            [command.to_dict() for command in commands],
+            lambda: self.client(
+                telethon.tl.functions.bots.SetBotCommandsRequest(
+                    telethon.tl.types.BotCommandScopeDefault(), lang_code='', commands=commands
+                )
             )
         )
 
+    @staticmethod
+    async def _rewind_file_and_send(send_function: Callable[..., Awaitable], *args, **kwargs) -> Any:
+        if isinstance(file := kwargs.get('file'), io.IOBase) and file.seekable():
+            file.seek(0)
+
+        return await send_function(*args, **kwargs)
+
     async def _start_async(self):
-        await self.sign_in()
+        with self.startup_profiler.phase('sign_in'):
+            await self.sign_in()
+        self._add_handlers()
 
         while True:
-            self._add_handlers()
             try:
                 await self.client.connect()
+                is_reconnection = self.reconnect_metrics.last_disconnect_date is not None
+                self.reconnect_metrics.on_connected()
+                if is_reconnection:
+                    await self.client.catch_up()
                 await self._on_ready()
                 await self.client.run_until_disconnected()
+                self.reconnect_metrics.on_disconnected()
             except OSError:
-                await asyncio.sleep(constants.TELEGRAM_RECONNECT_SLEEP_SECONDS)
-
-                self._owner_chat = None
-                self._registered_callbacks.clear()
-                self._registered_button_callbacks.clear()
-                self._message_cache.clear()
-
-                if self.user_session:
-                    self.user_client = TelegramClient(StringSession(self.user_session), self.api_id, self.api_hash)
-
-                if self.bot_session:
-                    self.client = TelegramClient(StringSession(self.bot_session), self.api_id, self.api_hash)
-                else:
-                    self.client = self.user_client
+                self.reconnect_metrics.on_failed_attempt()
+                backoff_seconds = min(
+                    constants.TELEGRAM_RECONNECT_MAX_SECONDS,
+                    constants.TELEGRAM_RECONNECT_BASE_SECONDS * 2 ** (self.reconnect_metrics.consecutive_failed_attempts - 1)
+                )
+                await asyncio.sleep(random.uniform(0, backoff_seconds))
 
     async def _unban(self, user: int | str | User, group_: int | str | Chat | Message, message: Message = None):
         user = await self.get_user(user, group_)
@@ -374,15 +454,17 @@ class TelegramBot(MultiBot[TelegramClient]):
     async def _on_ready(self):
         if not self._is_initialized:
             self.platform = Platform.TELEGRAM
-            me = await self.client.get_me()
-            self.id = me.id
-            self.name = me.username
+            with self.startup_profiler.phase('entities'):
+                me = await self.client.get_me()
+                self.id = me.id
+                self.name = me.username
 
-            if self.user_client:
-                async with use_user_client(self):
-                    self.owner_id = (await self.user_client.get_me()).id
+                if self.user_client:
+                    async with use_user_client(self):
+                        self.owner_id = (await self.user_client.get_me()).id
 
-            await self._register_commands()
+            with self.startup_profiler.phase('commands'):
+                await self._register_commands()
 
         await super()._on_ready()
 
@@ -567,10 +649,10 @@ class TelegramBot(MultiBot[TelegramClient]):
         enable_link_previews: bool = True,
         silent: bool = False,
         send_as_file: bool = None,
+        priority: SendPriority = None,
         raise_exceptions=False,
         edit=False
     ) -> Message | None:
-        file = await self._prepare_media_to_send(media, raise_exceptions=raise_exceptions)
         telegram_buttons = None
 
         if buttons:
@@ -582,164 +664,262 @@ class TelegramBot(MultiBot[TelegramClient]):
                 telegram_buttons.append(telegram_buttons_row)
 
         kwargs = {
-            'file': file,
             'parse_mode': 'html',
             'supports_streaming': True
         }
 
-        if message:
-            if send_as_file is None:
-                kwargs['force_document'] = bool(
-                    flanautils.cartesian_product_string_matching(
-                        message.text,
-                        constants.KEYWORDS['send_as_file'],
-                        constants.TELEGRAM_SEND_AS_FILE_MIN_SCORE
+        exit_stack = contextlib.ExitStack()
+
+        async def prepare_media_to_send(prefer_bytes=False) -> str | io.BytesIO | io.FileIO | None:
+            file = await self._prepare_media_to_send(media, prefer_bytes=prefer_bytes, raise_exceptions=raise_exceptions)
+            if isinstance(file, io.IOBase):
+                exit_stack.callback(file.close)
+            return file
+
+        with exit_stack:
+            if message:
+                if send_as_file is None:
+                    kwargs['force_document'] = bool(
+                        flanautils.cartesian_product_string_matching(
+                            message.text,
+                            constants.KEYWORDS['send_as_file'],
+                            constants.TELEGRAM_SEND_AS_FILE_MIN_SCORE
+                        )
                     )
-                )
-            else:
-                kwargs['force_document'] = send_as_file
-
-            if message.is_inline:
-                if media:
-                    if 'inline_medias' not in message.data:
-                        message.data['inline_medias'] = []
-                    message.data['inline_medias'].append(media)
-                return
-            elif edit:
-                if buttons is not None:
-                    kwargs['buttons'] = telegram_buttons
+                else:
+                    kwargs['force_document'] = send_as_file
 
-                try:
-                    message.original_object = await message.original_object.edit(text, **kwargs)
-                except (
-                        telethon.errors.rpcerrorlist.PeerIdInvalidError,
-                        telethon.errors.rpcerrorlist.MessageIdInvalidError,
-                        telethon.errors.rpcerrorlist.MessageNotModifiedError,
-                        telethon.errors.rpcerrorlist.UserIsBlockedError
-                ):
-                    if raise_exceptions:
-                        raise
+                if message.is_inline:
+                    if media:
+                        if 'inline_medias' not in message.data:
+                            message.data['inline_medias'] = []
+                        message.data['inline_medias'].append(media)
                     return
+                elif edit:
+                    if buttons is not None:
+                        kwargs['buttons'] = telegram_buttons
+                    kwargs['file'] = await prepare_media_to_send()
 
-                return self._update_message_attributes(
-                    message,
-                    media,
-                    buttons,
-                    chat,
-                    buttons_key,
-                    data,
-                    update_edit_date=True
-                )
+                    try:
+                        message.original_object = await self._schedule_send(
+                            functools.partial(self._rewind_file_and_send, message.original_object.edit, text, **kwargs),
+                            chat,
+                            message,
+                            priority
+                        )
+                    except (
+                            telethon.errors.rpcerrorlist.PeerIdInvalidError,
+                            telethon.errors.rpcerrorlist.MessageIdInvalidError,
+                            telethon.errors.rpcerrorlist.MessageNotModifiedError,
+                            telethon.errors.rpcerrorlist.UserIsBlockedError
+                    ):
+                        if raise_exceptions:
+                            raise
+                        return
 
-        match reply_to:
-            case str():
-                reply_to = int(reply_to)
-            case self.Message() as message_to_reply:
-                reply_to = message_to_reply.original_object
+                    return await self._update_message_attributes(
+                        message,
+                        media,
+                        buttons,
+                        chat,
+                        buttons_key,
+                        data,
+                        update_edit_date=True
+                    )
 
-        if text:
-            text_parts = flanautils.chunks(text, constants.TELEGRAM_MESSAGE_MAX_CHARACTERS)
-        else:
-            text_parts = (None,)
+            match reply_to:
+                case str():
+                    reply_to = int(reply_to)
+                case self.Message() as message_to_reply:
+                    reply_to = message_to_reply.original_object
 
-        for text_part in text_parts:
-            with flanautils.suppress_stderr():
-                attempts = 2
-                for attempt in range(attempts - 1, -1, -1):
-                    try:
-                        original_message = await self.client.send_message(
-                            chat.original_object,
-                            text_part,
-                            buttons=telegram_buttons,
-                            reply_to=reply_to,
-                            link_preview=enable_link_previews,
-                            silent=silent,
-                            **kwargs
-                        )
-                    except telethon.errors.rpcerrorlist.MediaEmptyError:
-                        if (
-                            (
-                                bytes_ := await self._prepare_media_to_send(
-                                    media,
-                                    prefer_bytes=True,
-                                    raise_exceptions=raise_exceptions
-                                )
+            uploaded_file_key = await self._get_uploaded_file_key(media, kwargs.get('force_document', False))
+            if uploaded_file := self._uploaded_files.get(uploaded_file_key):
+                kwargs['file'] = uploaded_file
+            else:
+                kwargs['file'] = await prepare_media_to_send()
+
+            if text:
+                text_parts = flanautils.chunks(text, constants.TELEGRAM_MESSAGE_MAX_CHARACTERS)
+            else:
+                text_parts = (None,)
+
+            for text_part in text_parts:
+                with flanautils.suppress_stderr():
+                    attempts = 3 if uploaded_file else 2
+                    for attempt in range(attempts - 1, -1, -1):
+                        try:
+                            original_message = await self._schedule_send(
+                                functools.partial(
+                                    self._rewind_file_and_send,
+                                    self.client.send_message,
+                                    chat.original_object,
+                                    text_part,
+                                    buttons=telegram_buttons,
+                                    reply_to=reply_to,
+                                    link_preview=enable_link_previews,
+                                    silent=silent,
+                                    **kwargs
+                                ),
+                                chat,
+                                message,
+                                priority
                             )
-                            and
-                            isinstance(bytes_, io.BytesIO)
-                        ):
-                            kwargs['file'] = bytes_
-                        elif raise_exceptions:
-                            raise
-                        else:
+                        except (telethon.errors.rpcerrorlist.FileReferenceExpiredError, telethon.errors.rpcerrorlist.MediaEmptyError):
+                            if uploaded_file and kwargs['file'] is uploaded_file:
+                                self._uploaded_files.pop(uploaded_file_key, None)
+                                kwargs['file'] = await prepare_media_to_send()
+                            elif (bytes_ := await prepare_media_to_send(prefer_bytes=True)) and isinstance(bytes_, io.IOBase):
+                                kwargs['file'] = bytes_
+                            elif raise_exceptions:
+                                raise
+                            else:
+                                return
+                        except ValueError as e:
+                            if 'parse' in str(e).lower() and attempt:
+                                try:
+                                    del kwargs['parse_mode']
+                                except KeyError:
+                                    pass
+                            elif raise_exceptions:
+                                raise
+                            else:
+                                return
+                        except telethon.errors.VideoContentTypeInvalidError:
+                            if attempt:
+                                try:
+                                    del kwargs['supports_streaming']
+                                except KeyError:
+                                    pass
+                            elif raise_exceptions:
+                                raise
+                            else:
+                                return
+                        except telethon.errors.WebpageCurlFailedError:
+                            if (bytes_ := await prepare_media_to_send(prefer_bytes=True)) and isinstance(bytes_, io.IOBase):
+                                kwargs['file'] = bytes_
+                            elif raise_exceptions:
+                                raise
+                            else:
+                                return
+                        except (telethon.errors.rpcerrorlist.MessageTooLongError, telethon.errors.rpcerrorlist.PeerIdInvalidError, telethon.errors.rpcerrorlist.UserIsBlockedError):
+                            if raise_exceptions:
+                                raise
                             return
-                    except ValueError as e:
-                        if 'parse' in str(e).lower() and attempt:
-                            try:
-                                del kwargs['parse_mode']
-                            except KeyError:
-                                pass
-                        elif raise_exceptions:
-                            raise
-                        else:
-                            return
-                    except telethon.errors.VideoContentTypeInvalidError:
-                        if attempt:
-                            try:
-                                del kwargs['supports_streaming']
-                            except KeyError:
-                                pass
-                        elif raise_exceptions:
-                            raise
                         else:
-                            return
-                    except telethon.errors.WebpageCurlFailedError:
-                        if (bytes_ := await self._prepare_media_to_send(media, prefer_bytes=True, raise_exceptions=raise_exceptions)) and isinstance(bytes_, io.BytesIO):
-                            kwargs['file'] = bytes_
-                        elif raise_exceptions:
-                            raise
-                        else:
-                            return
-                    except (telethon.errors.rpcerrorlist.MessageTooLongError, telethon.errors.rpcerrorlist.PeerIdInvalidError, telethon.errors.rpcerrorlist.UserIsBlockedError):
-                        if raise_exceptions:
-                            raise
-                        return
-                    else:
-                        break
+                            break
+
+                if media and kwargs['file'] is not uploaded_file:
+                    uploaded_file = self._get_uploaded_file(original_message)
+                    self._add_uploaded_file(uploaded_file_key, uploaded_file)
+                    if uploaded_file:
+                        kwargs['file'] = uploaded_file
 
-            original_message._sender = await self.client.get_me()
-            original_message._chat = chat.original_object
-            bot_message = await self._get_message(original_message)
-            self._update_message_attributes(bot_message, media, buttons, chat, buttons_key, data)
+                original_message._sender = await self.client.get_me()
+                original_message._chat = chat.original_object
+                bot_message = await self._get_message(original_message)
+                await self._update_message_attributes(bot_message, media, buttons, chat, buttons_key, data)
 
-        # noinspection PyUnboundLocalVariable
-        return bot_message
+            # noinspection PyUnboundLocalVariable
+            return bot_message
 
     @inline
     async def send_inline_results(self, message: Message):
-        async def create_result(media: Media, prefer_bytes=False) -> telethon.types.InputBotInlineResultPhoto | telethon.types.InputBotInlineResultDocument:
-            file = await self._prepare_media_to_send(media, prefer_bytes, is_inline=True)
-            match media.type_:
-                case MediaType.IMAGE:
-                    return message.original_event.builder.photo(file)
-                case _:
-                    return message.original_event.builder.document(file, title=media.type_.name.title(), type=media.type_.name.lower())
+        async def create_result(index: int, prefer_bytes=False) -> telethon.types.InputBotInlineResultPhoto | telethon.types.InputBotInlineResultDocument:
+            media = medias[index]
+            uploaded_file_key = await self._get_uploaded_file_key(media)
+            input_file_class = telethon.types.InputPhoto if media.type_ is MediaType.IMAGE else telethon.types.InputDocument
+            if prefer_bytes or not isinstance(file := self._uploaded_files.get(uploaded_file_key), input_file_class):
+                file = await self._prepare_media_to_send(media, prefer_bytes, is_inline=True)
+                if isinstance(file, str):
+                    url_based_indices.add(index)
+                else:
+                    url_based_indices.discard(index)
+
+            try:
+                match media.type_:
+                    case MediaType.IMAGE:
+                        result = await message.original_event.builder.photo(file)
+                        self._add_uploaded_file(uploaded_file_key, result.photo)
+                    case _:
+                        result = await message.original_event.builder.document(file, title=media.type_.name.title(), type=media.type_.name.lower())
+                        self._add_uploaded_file(uploaded_file_key, result.document)
+            finally:
+                if isinstance(file, io.IOBase):
+                    file.close()
+
+            return result
+
+        async def create_result_or_retry_with_bytes(index: int) -> telethon.types.InputBotInlineResultPhoto | telethon.types.InputBotInlineResultDocument:
+            try:
+                return await create_result(index)
+            except (
+                    telethon.errors.rpcerrorlist.FileReferenceExpiredError,
+                    telethon.errors.rpcerrorlist.MediaEmptyError,
+                    telethon.errors.rpcerrorlist.WebpageCurlFailedError
+            ):
+                self._uploaded_files.pop(await self._get_uploaded_file_key(medias[index]), None)
+                return await create_result(index, prefer_bytes=True)
+
+        async def create_results(
+            indices: Iterable[int],
+            create_function: Callable[[int], Awaitable[telethon.types.InputBotInlineResultPhoto | telethon.types.InputBotInlineResultDocument]]
+        ) -> dict[int, telethon.types.InputBotInlineResultPhoto | telethon.types.InputBotInlineResultDocument]:
+            tasks = {index: asyncio.create_task(create_function(index)) for index in indices}
+            if tasks and (remaining_seconds := (deadline - datetime.datetime.now(datetime.timezone.utc)).total_seconds()) > 0:
+                done, _ = await asyncio.wait(tasks.values(), timeout=remaining_seconds)
+            else:
+                done = ()
+
+            results_ = {}
+            for index, task in tasks.items():
+                if task in done and not task.exception():
+                    results_[index] = task.result()
+                else:
+                    task.cancel()
+            return results_
+
+        async def answer(results_: dict[int, telethon.types.InputBotInlineResultPhoto | telethon.types.InputBotInlineResultDocument]) -> bool:
+            if not results_:
+                return False
+
+            await message.original_event.answer([results_[index] for index in sorted(results_)])
+            return True
+
+        try:
+            medias = message.data['inline_medias']
+        except (AttributeError, KeyError):
+            return
+
+        deadline = message.date + datetime.timedelta(seconds=constants.TELEGRAM_INLINE_ANSWER_BUDGET_SECONDS)
+        url_based_indices = set()
 
         with flanautils.suppress_stderr():
             try:
+                results = await create_results(range(len(medias)), create_result_or_retry_with_bytes)
                 try:
-                    await message.original_event.answer([await create_result(media) for media in message.data['inline_medias']])
-                except telethon.errors.rpcerrorlist.WebpageCurlFailedError:
-                    await message.original_event.answer([await create_result(media, prefer_bytes=True) for media in message.data['inline_medias']])
+                    answered = await answer(results)
+                except (
+                        telethon.errors.rpcerrorlist.FileReferenceExpiredError,
+                        telethon.errors.rpcerrorlist.MediaEmptyError,
+                        telethon.errors.rpcerrorlist.WebpageCurlFailedError
+                ):
+                    retried_indices = url_based_indices & results.keys()
+                    results = {index: result for index, result in results.items() if index not in retried_indices}
+                    results |= await create_results(retried_indices, functools.partial(create_result, prefer_bytes=True))
+                    answered = await answer(results)
             except telethon.errors.rpcerrorlist.QueryIdInvalidError:
+                answered = False
+            except AttributeError:
+                return
+
+            if not answered:
                 chat = await self.get_chat(message.author)
                 await self.send('Te lo envío por aquí. El proceso tardó demasiado para enviar inline.', chat)
                 bot_state_message = await self.send('Enviando...', chat)
-                for media in message.data['inline_medias']:
+                for media in medias:
                     await self.send(media, chat)
                 await self.delete_message(bot_state_message)
-            except (AttributeError, KeyError):
-                pass
 
     async def sign_in(self):
         if self.user_client and not self.user_session:
@@ -1,6 +1,7 @@
 __all__ = ['TwitchBot']
 
 import datetime
+import functools
 import re
 from collections import defaultdict
 from typing import Any, Iterable, Iterator
@@ -13,7 +14,7 @@ from flanautils import Media, OrderedSet, return_if_first_empty
 
 from multibot import constants
 from multibot.bots.multi_bot import MultiBot, parse_arguments
-from multibot.models import Button, Chat, Message, Platform, User
+from multibot.models import Button, Chat, Message, Platform, SendPriority, SendScheduler, User
 
 
 # --------------------------------------------------------------------------------------------------- #
@@ -21,8 +22,16 @@ from multibot.models import Button, Chat, Message, Platform, User
 # --------------------------------------------------------------------------------------------------- #
 class TwitchBot(MultiBot[twitchio.Client]):
     def __init__(self, token: str, initial_channels: Iterable[str] = None, owner_name: str = None):
-        super().__init__(token=token,
-                         client=twitchio.ext.commands.Bot(token=token, prefix='/', initial_channels=initial_channels))
+        super().__init__(
+            token=token,
+            client=twitchio.ext.commands.Bot(token=token, prefix='/', initial_channels=initial_channels),
+            send_scheduler=SendScheduler(
+                constants.TWITCH_SEND_GLOBAL_TIMES,
+                constants.TWITCH_SEND_GLOBAL_SECONDS,
+                constants.TWITCH_SEND_CHAT_TIMES,
+                constants.TWITCH_SEND_CHAT_SECONDS
+            )
+        )
         self.owner_name = owner_name
 
     # -------------------------------------------------------- #
@@ -84,6 +93,16 @@ class TwitchBot(MultiBot[twitchio.Client]):
     async def _get_date(self, original_message: constants.TWITCH_MESSAGE) -> datetime.datetime | None:
         return original_message.timestamp.replace(tzinfo=datetime.timezone.utc)
 
+    @return_if_first_empty(exclude_self_types='TwitchBot', globals_=globals())
+    async def _get_event_chat_id(self, event: constants.TWITCH_MESSAGE) -> str | None:
+        return event.channel.name
+
+    @return_if_first_empty(exclude_self_types='TwitchBot', globals_=globals())
+    async def _get_event_user_id(self, event: constants.TWITCH_MESSAGE) -> int | None:
+        if event.echo:
+            return self.id
+        return int(event.author.id)
+
     @return_if_first_empty(exclude_self_types='TwitchBot', globals_=globals())
     async def _get_mentions(self, original_message: constants.TWITCH_MESSAGE) -> list[User]:
         text = await self._get_text(original_message)
@@ -115,6 +134,13 @@ class TwitchBot(MultiBot[twitchio.Client]):
         except KeyError:
             pass
 
+    @return_if_first_empty(exclude_self_types='TwitchBot', globals_=globals())
+    async def _get_replied_message_id(self, original_message: constants.TWITCH_MESSAGE) -> int | str | None:
+        try:
+            return original_message.tags['reply-parent-msg-id']
+        except KeyError:
+            pass
+
     @return_if_first_empty(exclude_self_types='TwitchBot', globals_=globals())
     async def _get_text(self, original_message: constants.TWITCH_MESSAGE) -> str:
         return original_message.content
@@ -138,10 +164,11 @@ class TwitchBot(MultiBot[twitchio.Client]):
     async def _on_ready(self):
         if not self._is_initialized:
             self.platform = Platform.TWITCH
-            self.id = (await self.client.fetch_users([self.client.nick]))[0].id
-            self.name = self.client.nick
-            if self.owner_name:
-                self.owner_id = (await self.client.fetch_users([self.owner_name]))[0].id
+            with self.startup_profiler.phase('entities'):
+                self.id = (await self.client.fetch_users([self.client.nick]))[0].id
+                self.name = self.client.nick
+                if self.owner_name:
+                    self.owner_id = (await self.client.fetch_users([self.owner_name]))[0].id
 
         await super()._on_ready()
 
@@ -277,16 +304,19 @@ class TwitchBot(MultiBot[twitchio.Client]):
         enable_link_previews: bool = True,
         silent: bool = False,
         send_as_file: bool = None,
+        priority: SendPriority = None,
         raise_exceptions=False,
         edit=False
     ):
         match reply_to:
             case str(message_id):
                 # noinspection PyProtectedMember
-                await message.chat.original_object._ws.reply(message_id, f"PRIVMSG #{message.author.name.lower()} :{text}\r\n")
+                send_function = functools.partial(message.chat.original_object._ws.reply, message_id, f"PRIVMSG #{message.author.name.lower()} :{text}\r\n")
             case self.Message() as message_to_reply:
                 # noinspection PyUnresolvedReferences
                 context = await self.client.get_context(message_to_reply.original_object)
-                await context.reply(text)
+                send_function = functools.partial(context.reply, text)
             case _:
-                await chat.original_object.send(text)
+                send_function = functools.partial(chat.original_object.send, text)
+
+        await self._schedule_send(send_function, chat, message, priority)
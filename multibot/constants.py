@@ -1,45 +1,111 @@
 import datetime
+import functools
+import operator
 import os
+import pathlib
+import sys
+import tempfile
+from typing import Any
 
-import discord.ext.commands
 import flanautils
-import telethon.tl.types
-
-DISCORD_USER = discord.User | discord.Member | discord.ClientUser
-DISCORD_CHAT = discord.abc.Messageable | discord.ext.commands.Context | discord.channel.DMChannel | discord.channel.GroupChannel | discord.Member | discord.channel.TextChannel | discord.abc.User
-DISCORD_GROUP = discord.Guild
-DISCORD_ROLE = discord.Role
-DISCORD_MESSAGE = discord.Message
-DISCORD_INTERACTION_EVENT = discord.Interaction
-DISCORD_NEW_MESSAGE_EVENT = DISCORD_MESSAGE
-DISCORD_EVENT = DISCORD_INTERACTION_EVENT | DISCORD_NEW_MESSAGE_EVENT
-
-TELEGRAM_USER = telethon.types.User
-TELEGRAM_CHAT = TELEGRAM_USER | telethon.types.Channel | telethon.types.Chat
-TELEGRAM_GROUP = TELEGRAM_CHAT
-TELEGRAM_MESSAGE = telethon.custom.Message
-TELEGRAM_BUTTON_EVENT = telethon.events.CallbackQuery.Event
-TELEGRAM_INLINE_EVENT = telethon.events.InlineQuery.Event
-TELEGRAM_NEW_MESSAGE_EVENT = telethon.events.NewMessage.Event
-TELEGRAM_EVENT = TELEGRAM_BUTTON_EVENT | TELEGRAM_INLINE_EVENT | TELEGRAM_NEW_MESSAGE_EVENT
-
-# TWITCH_USER = twitchio.Chatter | twitchio.User
-# TWITCH_CHAT = twitchio.Channel | twitchio.ChannelInfo
-# TWITCH_GROUP = TWITCH_CHAT
-# TWITCH_MESSAGE = twitchio.Message
-# TWITCH_NEW_MESSAGE_EVENT = TWITCH_MESSAGE
-# TWITCH_EVENT = TWITCH_NEW_MESSAGE_EVENT
-
-ORIGINAL_USER = DISCORD_USER | TELEGRAM_USER  # | TWITCH_USER
-ORIGINAL_CHAT = DISCORD_CHAT | TELEGRAM_CHAT  # | TWITCH_CHAT
-ORIGINAL_GROUP = DISCORD_GROUP | TELEGRAM_GROUP  # | TWITCH_GROUP
-ROLE = DISCORD_ROLE
-ORIGINAL_MESSAGE = DISCORD_INTERACTION_EVENT | DISCORD_MESSAGE | TELEGRAM_INLINE_EVENT | TELEGRAM_MESSAGE  # ORIGINAL_MESSAGE = DISCORD_MESSAGE | TELEGRAM_MESSAGE | TWITCH_MESSAGE | TELEGRAM_INLINE_EVENT
-MESSAGE_EVENT = DISCORD_EVENT | TELEGRAM_EVENT | TELEGRAM_MESSAGE  # MESSAGE_EVENT = DISCORD_EVENT | TELEGRAM_EVENT | TWITCH_EVENT | TELEGRAM_MESSAGE
 
+
+def _discord_aliases() -> dict[str, Any]:
+    import discord.ext.commands
+
+    DISCORD_USER = discord.User | discord.Member | discord.ClientUser
+    DISCORD_CHAT = discord.abc.Messageable | discord.ext.commands.Context | discord.channel.DMChannel | discord.channel.GroupChannel | discord.Member | discord.channel.TextChannel | discord.abc.User
+    DISCORD_GROUP = discord.Guild
+    DISCORD_ROLE = discord.Role
+    DISCORD_MESSAGE = discord.Message
+    DISCORD_INTERACTION_EVENT = discord.Interaction
+    DISCORD_NEW_MESSAGE_EVENT = DISCORD_MESSAGE
+    DISCORD_EVENT = DISCORD_INTERACTION_EVENT | DISCORD_NEW_MESSAGE_EVENT
+
+    return {k: v for k, v in locals().items() if k.startswith('DISCORD_')}
+
+
+def _telegram_aliases() -> dict[str, Any]:
+    import telethon.tl.types
+
+    TELEGRAM_USER = telethon.types.User
+    TELEGRAM_CHAT = TELEGRAM_USER | telethon.types.Channel | telethon.types.Chat
+    TELEGRAM_GROUP = TELEGRAM_CHAT
+    TELEGRAM_MESSAGE = telethon.custom.Message
+    TELEGRAM_BUTTON_EVENT = telethon.events.CallbackQuery.Event
+    TELEGRAM_INLINE_EVENT = telethon.events.InlineQuery.Event
+    TELEGRAM_NEW_MESSAGE_EVENT = telethon.events.NewMessage.Event
+    TELEGRAM_EVENT = TELEGRAM_BUTTON_EVENT | TELEGRAM_INLINE_EVENT | TELEGRAM_NEW_MESSAGE_EVENT
+    TELEGRAM_CHAT_PEER_CLASSES = (telethon.tl.types.PeerUser, telethon.tl.types.PeerChat, telethon.tl.types.PeerChannel)
+
+    return {k: v for k, v in locals().items() if k.startswith('TELEGRAM_')}
+
+
+# def _twitch_aliases() -> dict[str, Any]:
+#     import twitchio
+#
+#     TWITCH_USER = twitchio.Chatter | twitchio.User
+#     TWITCH_CHAT = twitchio.Channel | twitchio.ChannelInfo
+#     TWITCH_GROUP = TWITCH_CHAT
+#     TWITCH_MESSAGE = twitchio.Message
+#     TWITCH_NEW_MESSAGE_EVENT = TWITCH_MESSAGE
+#     TWITCH_EVENT = TWITCH_NEW_MESSAGE_EVENT
+#
+#     return {k: v for k, v in locals().items() if k.startswith('TWITCH_')}
+
+
+_PLATFORM_ALIASES = {
+    'DISCORD': ('discord', _discord_aliases),
+    'TELEGRAM': ('telethon', _telegram_aliases)
+    # 'TWITCH': ('twitchio', _twitch_aliases)
+}
+_COMBINED_ALIASES = {
+    'ORIGINAL_USER': {'DISCORD': ('DISCORD_USER',), 'TELEGRAM': ('TELEGRAM_USER',)},
+    'ORIGINAL_CHAT': {'DISCORD': ('DISCORD_CHAT',), 'TELEGRAM': ('TELEGRAM_CHAT',)},
+    'ORIGINAL_GROUP': {'DISCORD': ('DISCORD_GROUP',), 'TELEGRAM': ('TELEGRAM_GROUP',)},
+    'ROLE': {'DISCORD': ('DISCORD_ROLE',)},
+    'ORIGINAL_MESSAGE': {'DISCORD': ('DISCORD_INTERACTION_EVENT', 'DISCORD_MESSAGE'), 'TELEGRAM': ('TELEGRAM_INLINE_EVENT', 'TELEGRAM_MESSAGE')},
+    'MESSAGE_EVENT': {'DISCORD': ('DISCORD_EVENT',), 'TELEGRAM': ('TELEGRAM_EVENT', 'TELEGRAM_MESSAGE')}
+}
+
+
+@functools.cache
+def _get_platform_aliases(platform_name: str) -> dict[str, Any]:
+    return _PLATFORM_ALIASES[platform_name][1]()
+
+
+@functools.cache
+def _get_combined_alias(name: str, platform_names: tuple[str, ...]) -> Any:
+    types_ = [
+        _get_platform_aliases(platform_name)[alias_name]
+        for platform_name in platform_names
+        for alias_name in _COMBINED_ALIASES[name].get(platform_name, ())
+    ]
+    return functools.reduce(operator.or_, types_) if types_ else Any
+
+
+def __dir__() -> list[str]:
+    return sorted({*globals(), *_COMBINED_ALIASES, *(name for platform_name in _PLATFORM_ALIASES for name in _get_platform_aliases(platform_name))})
+
+
+def __getattr__(name: str) -> Any:
+    if name in _COMBINED_ALIASES:
+        loaded_platform_names = tuple(platform_name for platform_name, (module_name, _) in _PLATFORM_ALIASES.items() if module_name in sys.modules)
+        return _get_combined_alias(name, loaded_platform_names)
+
+    platform_name = name.split('_', 1)[0]
+    if platform_name in _PLATFORM_ALIASES and name in (platform_aliases := _get_platform_aliases(platform_name)):
+        return platform_aliases[name]
+
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+
+BLOB_STORE_COLLECTION_NAME = 'blob'
 BUTTONS_INFOS_EXPIRATION_TIME = datetime.timedelta(weeks=1)
+CALLBACK_PROFILING = bool(int(os.environ.get('CALLBACK_PROFILING', 0)))
 CHECK_OLD_CACHE_MESSAGES_EVERY_SECONDS = datetime.timedelta(days=1).total_seconds()
 CHECK_OLD_DATABASE_MESSAGES_EVERY_SECONDS = datetime.timedelta(days=1).total_seconds()
+CHECK_OLD_RATE_LIMIT_BUCKETS_EVERY_SECONDS = datetime.timedelta(hours=1).total_seconds()
 CHECK_PENALTIES_EVERY_SECONDS = datetime.timedelta(hours=1).total_seconds()
 COMMAND_MESSAGE_DURATION = 5
 DATABASE_MESSAGE_EXPIRATION_TIME = datetime.timedelta(weeks=flanautils.WEEKS_IN_A_MONTH)
@@ -50,9 +116,38 @@ DISCORD_BUTTONS_MAX = 5
 DISCORD_COMMAND_PREFIX = flanautils.random_string()
 DISCORD_MAX_USER_TIMEOUT = datetime.timedelta(days=28)
 DISCORD_MEDIA_MAX_BYTES = 10_000_000
+DISCORD_MEMBERS_CACHE_SECONDS = datetime.timedelta(minutes=10).total_seconds()
+DISCORD_MEMBERS_CACHE_SIZE = 10
+DISCORD_MEMBERS_QUERY_CACHE_SIZE = 10_000
+DISCORD_MEMBERS_QUERY_LIMIT = 100
+DISCORD_MEMBERS_QUERY_TIMEOUT_SECONDS = 3
 DISCORD_MESSAGE_MAX_CHARACTERS = 2000
+DISCORD_SEND_CHAT_SECONDS = 5
+DISCORD_SEND_CHAT_TIMES = 5
+DISCORD_SEND_GLOBAL_SECONDS = 1
+DISCORD_SEND_GLOBAL_TIMES = 50
+DISCORD_USER_NAME_MAX_CHARACTERS = 32
+DISCORD_USER_NAME_MIN_CHARACTERS = 2
 ERROR_MESSAGE_DURATION = 10
+LOOP_STALL_THRESHOLD_SECONDS = 0.1
+LOOP_STALLS_MEMORY = 100
+LOOP_WATCHDOG = bool(int(os.environ.get('LOOP_WATCHDOG', 0)))
+LOOP_WATCHDOG_INTERVAL_SECONDS = 0.05
 MAX_FILE_EXTENSION_LENGHT = 5
+MEDIA_CACHE_CHUNK_BYTES = 65_536
+MEDIA_CACHE_DISK_MAX_BYTES = 2_000_000_000
+MEDIA_CACHE_MAX_KEYS = 10_000
+MEDIA_CACHE_MEMORY_MAX_BYTES = 200_000_000
+MEDIA_CACHE_PATH = pathlib.Path(tempfile.gettempdir()) / 'multibot' / 'media_cache'
+MEDIA_CACHE_URL_KEY_SECONDS = datetime.timedelta(days=1).total_seconds()
+MEDIA_PROCESSOR_MAX_QUEUED = 20
+MEDIA_PROCESSOR_MAX_WORKERS = 2
+MEDIA_PROCESSOR_QUEUE_TIMEOUT_SECONDS = 60
+MEDIA_PROCESSOR_TIMEOUT_SECONDS = 60
+MEDIA_SIZE_OVERHEAD_BYTES = 1_000
+METRICS_HISTOGRAM_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+METRICS_HOST = 'localhost'
+METRICS_PORT = 8000
 PARSER_KEYWORDS_LENGHT_PENALTY = 0.001
 PARSER_MAX_WORD_LENGTH = 25
 PARSER_MIN_SCORE_DEFAULT = 0.915
@@ -60,13 +155,32 @@ PARSER_MIN_SCORE_TO_MATCH = 3
 PARSER_SCORE_REWARD_EXPONENT = 2
 PYMONGO_MEDIA_MAX_BYTES = 15_000_000
 RAISE_AMBIGUITY_ERROR = False
+RATE_LIMITED_EVENTS_MEMORY = 1000
 SEND_EXCEPTION_MESSAGE_LINES = 0
+SEND_MAX_RETRIES = 3
+SEND_MAX_RETRY_AFTER_SECONDS = datetime.timedelta(minutes=5).total_seconds()
+STARTUP_PROFILING = bool(int(os.environ.get('STARTUP_PROFILING', 0)))
 TELEGRAM_BUTTONS_MAX_PER_LINE = 8
+TELEGRAM_INLINE_ANSWER_BUDGET_SECONDS = 8
 TELEGRAM_MESSAGE_MAX_CHARACTERS = 4096
-TELEGRAM_CHAT_PEER_CLASSES = (telethon.tl.types.PeerUser, telethon.tl.types.PeerChat, telethon.tl.types.PeerChannel)
-TELEGRAM_RECONNECT_SLEEP_SECONDS = datetime.timedelta(minutes=5).total_seconds()
+TELEGRAM_RECONNECT_BASE_SECONDS = 1
+TELEGRAM_RECONNECT_MAX_SECONDS = datetime.timedelta(minutes=5).total_seconds()
 TELEGRAM_SEND_AS_FILE_MIN_SCORE = 0.85
+TELEGRAM_SEND_CHAT_SECONDS = 60
+TELEGRAM_SEND_CHAT_TIMES = 20
+TELEGRAM_SEND_GLOBAL_SECONDS = 1
+TELEGRAM_SEND_GLOBAL_TIMES = 30
+TELEGRAM_UPLOADED_FILES_CACHE_SIZE = 1000
 TIME_THRESHOLD_TO_MANUAL_UNPENALIZE = datetime.timedelta(days=3)
+TRACING_BATCH_SIZE = 512
+TRACING_FLUSH_INTERVAL_SECONDS = 5
+TRACING_OTLP_ENDPOINT = 'http://localhost:4318/v1/traces'
+TRACING_PATH = pathlib.Path(tempfile.gettempdir()) / 'multibot' / 'traces.jsonl'
+TRACING_SERVICE_NAME = 'multibot'
+TWITCH_SEND_CHAT_SECONDS = 1
+TWITCH_SEND_CHAT_TIMES = 1
+TWITCH_SEND_GLOBAL_SECONDS = 30
+TWITCH_SEND_GLOBAL_TIMES = 20
 
 SAD_EMOJIS = '😥😪😓😔😕☹🙁😞😢😭😩😰'
 
@@ -1,9 +1,21 @@
+from multibot.models.blob_store import *
 from multibot.models.buttons import *
+from multibot.models.callback_profiler import *
 from multibot.models.chat import *
+from multibot.models.commands_fingerprint import *
 from multibot.models.enums import *
 from multibot.models.event_component import *
+from multibot.models.loop_watchdog import *
+from multibot.models.media_cache import *
+from multibot.models.media_processor import *
 from multibot.models.message import *
+from multibot.models.metrics import *
 from multibot.models.penalties import *
+from multibot.models.rate_limit import *
+from multibot.models.reconnect_metrics import *
 from multibot.models.registered_callback import *
 from multibot.models.role import *
+from multibot.models.send_scheduler import *
+from multibot.models.startup_profiler import *
+from multibot.models.tracing import *
 from multibot.models.user import *
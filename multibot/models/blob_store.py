@@ -0,0 +1,155 @@
+__all__ = ['BlobStore', 'StoredMedia', 'media_size']
+
+import asyncio
+import dataclasses
+import datetime
+import hashlib
+from dataclasses import dataclass, field
+from typing import ClassVar
+
+import gridfs
+import pymongo.collection
+import pymongo.database
+from flanautils import Media
+
+from multibot import constants
+from multibot.models.message import Message
+
+
+class BlobStore:
+    def __init__(self, database: pymongo.database.Database | None = None, collection_name: str = constants.BLOB_STORE_COLLECTION_NAME):
+        self._database = database
+        self.collection_name = collection_name
+        self._grid_fs: gridfs.GridFS | None = None
+
+    def _delete_unreferenced(self, before_date: datetime.datetime) -> int:
+        if not self.grid_fs:
+            return 0
+
+        blob_ids = [
+            file['_id'] for file in self.files_collection.find(
+                {
+                    '$or': [
+                        {'metadata.last_referenced_date': {'$lte': before_date}},
+                        {'metadata.last_referenced_date': {'$exists': False}, 'uploadDate': {'$lte': before_date}}
+                    ]
+                },
+                {'_id': True}
+            )
+        ]
+        for blob_id in blob_ids:
+            self.grid_fs.delete(blob_id)
+
+        return len(blob_ids)
+
+    def _get(self, blob_id: str) -> bytes | None:
+        if not self.grid_fs:
+            return
+
+        try:
+            return self.grid_fs.get(blob_id).read()
+        except gridfs.NoFile:
+            pass
+
+    def _put(self, bytes_: bytes) -> str | None:
+        if not self.grid_fs:
+            return
+
+        blob_id = hashlib.sha256(bytes_).hexdigest()
+        if not self._touch(blob_id):
+            try:
+                self.grid_fs.put(bytes_, _id=blob_id, metadata={'last_referenced_date': datetime.datetime.now(datetime.timezone.utc)})
+            except gridfs.FileExists:
+                self._touch(blob_id)
+
+        return blob_id
+
+    def _store_media(self, media: Media | None) -> Media | None:
+        if not media:
+            return media
+
+        blob_id = media.blob_id if isinstance(media, StoredMedia) else None
+        if media.bytes_:
+            if not (blob_id := self._put(media.bytes_)) and media_size(media) <= constants.PYMONGO_MEDIA_MAX_BYTES:
+                return media
+        elif blob_id:
+            self._touch(blob_id)
+
+        return StoredMedia(
+            **{field_.name: getattr(media, field_.name) for field_ in dataclasses.fields(Media)} | {
+                'song_info': self._store_media(media.song_info),
+                'blob_id': blob_id
+            }
+        )
+
+    def _touch(self, blob_id: str) -> bool:
+        return bool(
+            self.files_collection.update_one(
+                {'_id': blob_id},
+                {'$set': {'metadata.last_referenced_date': datetime.datetime.now(datetime.timezone.utc)}}
+            ).matched_count
+        )
+
+    @property
+    def database(self) -> pymongo.database.Database | None:
+        return self._database if self._database is not None else Message.database
+
+    @property
+    def files_collection(self) -> pymongo.collection.Collection | None:
+        if self.database is not None:
+            return self.database[f'{self.collection_name}.files']
+
+    @property
+    def grid_fs(self) -> gridfs.GridFS | None:
+        if self._grid_fs is None and self.database is not None:
+            self._grid_fs = gridfs.GridFS(self.database, collection=self.collection_name)
+        return self._grid_fs
+
+    async def delete_unreferenced(self, before_date: datetime.datetime) -> int:
+        return await asyncio.to_thread(self._delete_unreferenced, before_date)
+
+    async def get(self, blob_id: str) -> bytes | None:
+        return await asyncio.to_thread(self._get, blob_id)
+
+    async def put(self, bytes_: bytes) -> str | None:
+        return await asyncio.to_thread(self._put, bytes_)
+
+    async def store_media(self, media: Media | None) -> Media | None:
+        if not media:
+            return media
+
+        return await asyncio.to_thread(self._store_media, media)
+
+
+@dataclass(unsafe_hash=True)
+class StoredMedia(Media):
+    bytes_: bytes = field(default=None, compare=False)
+    blob_id: str = None
+    blob_store: ClassVar[BlobStore] = BlobStore()
+
+    def __bool__(self):
+        return bool(self.url or self.bytes_ or self.blob_id)
+
+    def __getstate__(self):
+        return vars(self) | {'bytes_': None}
+
+    async def load_bytes(self) -> bytes | None:
+        if self.bytes_ is None and self.blob_id:
+            self.bytes_ = await self.blob_store.get(self.blob_id)
+
+        return self.bytes_
+
+
+def media_size(media: Media | None) -> int:
+    if not media:
+        return 0
+
+    return (
+        constants.MEDIA_SIZE_OVERHEAD_BYTES
+        +
+        len(media.bytes_ or b'')
+        +
+        sum(len(value) for value in (media.url, media.extension, media.title, media.author, media.album) if isinstance(value, str))
+        +
+        media_size(media.song_info)
+    )
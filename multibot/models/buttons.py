@@ -30,14 +30,28 @@ class ButtonsInfo(FlanaBase):
         if not isinstance(item, str):
             raise TypeError('index has to be a string')
 
-        for row in self.buttons:
-            for button in row:
-                if button.text == item:
-                    return button
+        return self._buttons_by_text.get(item)
+
+    def __getstate__(self) -> dict[str, Any]:
+        state = vars(self).copy()
+        del state['_buttons_by_text']
+        return state
+
+    def __setattr__(self, name: str, value: Any):
+        super().__setattr__(name, value)
+        if name == 'buttons':
+            self.index_buttons()
+
+    def __setstate__(self, state: dict[str, Any]):
+        vars(self).update(state)
+        self.index_buttons()
 
     def _dict_repr(self) -> Any:
         return bytes(self)
 
+    def _json_repr(self) -> Any:
+        return self.__getstate__()
+
     @property
     def checked_buttons(self) -> list[Button]:
         return [button for row in self.buttons for button in row if button.is_checked]
@@ -45,6 +59,13 @@ class ButtonsInfo(FlanaBase):
     def find_button(self, text: str) -> Button:
         return self[text]
 
+    def index_buttons(self):
+        buttons_by_text = {}
+        for row in self.buttons or ():
+            for button in row:
+                buttons_by_text.setdefault(button.text, button)
+        super().__setattr__('_buttons_by_text', buttons_by_text)
+
     @property
     def pressed_button(self) -> Button | None:
         return self[self.pressed_text]
@@ -0,0 +1,144 @@
+__all__ = ['CallbackProfile', 'CallbackProfiler', 'CallbackProfilerCommandListener']
+
+import json
+import pathlib
+import time
+from collections.abc import Coroutine, Generator
+from dataclasses import asdict, dataclass
+from typing import Any
+
+import pymongo.monitoring
+
+from multibot import constants
+
+
+@dataclass
+class CallbackProfile:
+    name: str
+    calls: int = 0
+    errors: int = 0
+    seconds: float = 0
+    max_seconds: float = 0
+    blocking_seconds: float = 0
+    max_blocking_seconds: float = 0
+    steps: int = 0
+    database_calls: int = 0
+    database_seconds: float = 0
+
+    @property
+    def mean_blocking_seconds(self) -> float:
+        return self.blocking_seconds / self.calls if self.calls else 0
+
+    @property
+    def mean_seconds(self) -> float:
+        return self.seconds / self.calls if self.calls else 0
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self) | {'mean_seconds': self.mean_seconds, 'mean_blocking_seconds': self.mean_blocking_seconds}
+
+
+class CallbackProfilerCommandListener(pymongo.monitoring.CommandListener):
+    def __init__(self, callback_profiler: CallbackProfiler):
+        self.callback_profiler = callback_profiler
+
+    def failed(self, event: pymongo.monitoring.CommandFailedEvent):
+        self.callback_profiler.add_database_call(event.duration_micros / 1e6)
+
+    def started(self, event: pymongo.monitoring.CommandStartedEvent):
+        pass
+
+    def succeeded(self, event: pymongo.monitoring.CommandSucceededEvent):
+        self.callback_profiler.add_database_call(event.duration_micros / 1e6)
+
+
+class CallbackProfiler:
+    def __init__(self, is_enabled: bool = None):
+        self.is_enabled = constants.CALLBACK_PROFILING if is_enabled is None else is_enabled
+        self.profiles: dict[str, CallbackProfile] = {}
+        self._current_profile: CallbackProfile | None = None
+        self._is_monitoring_database = False
+        if self.is_enabled:
+            self.monitor_database()
+
+    def __str__(self):
+        lines = [f"{'callback':<40} {'calls':>7} {'errors':>6} {'mean ms':>9} {'max ms':>9} {'block ms':>9} {'max block':>9} {'db calls':>8} {'db ms':>9}"]
+        for profile in self.report():
+            lines.append(
+                f"{profile['name'][:40]:<40} {profile['calls']:>7} {profile['errors']:>6} "
+                f"{profile['mean_seconds'] * 1000:>9.2f} {profile['max_seconds'] * 1000:>9.2f} "
+                f"{profile['mean_blocking_seconds'] * 1000:>9.2f} {profile['max_blocking_seconds'] * 1000:>9.2f} "
+                f"{profile['database_calls']:>8} {profile['database_seconds'] * 1000:>9.2f}"
+            )
+
+        return '\n'.join(lines)
+
+    def add_database_call(self, seconds: float):
+        if self._current_profile:
+            self._current_profile.database_calls += 1
+            self._current_profile.database_seconds += seconds
+
+    def clear(self):
+        self.profiles.clear()
+
+    def dump(self, path: str | pathlib.Path, sort_by='blocking_seconds'):
+        pathlib.Path(path).write_text(json.dumps(self.report(sort_by), indent=4))
+
+    def monitor_database(self):
+        if not self._is_monitoring_database:
+            self._is_monitoring_database = True
+            pymongo.monitoring.register(CallbackProfilerCommandListener(self))
+
+    async def profile(self, name: str, coroutine: Coroutine) -> Any:
+        if not self.is_enabled:
+            return await coroutine
+
+        if not (profile := self.profiles.get(name)):
+            profile = self.profiles[name] = CallbackProfile(name)
+
+        return await _ProfiledCoroutine(self, profile, coroutine)
+
+    def report(self, sort_by='blocking_seconds', reverse=True) -> list[dict[str, Any]]:
+        return sorted((profile.to_dict() for profile in self.profiles.values()), key=lambda profile: profile[sort_by], reverse=reverse)
+
+
+class _ProfiledCoroutine:
+    def __init__(self, callback_profiler: CallbackProfiler, profile: CallbackProfile, coroutine: Coroutine):
+        self.callback_profiler = callback_profiler
+        self.profile = profile
+        self.coroutine = coroutine
+
+    def __await__(self) -> Generator[Any, Any, Any]:
+        profile = self.profile
+        start_time = time.perf_counter()
+        function = self.coroutine.send
+        value = None
+        try:
+            while True:
+                self.callback_profiler._current_profile = profile
+                step_start_time = time.perf_counter()
+                try:
+                    future = function(value)
+                except StopIteration as e:
+                    return e.value
+                finally:
+                    step_seconds = time.perf_counter() - step_start_time
+                    self.callback_profiler._current_profile = None
+                    profile.steps += 1
+                    profile.blocking_seconds += step_seconds
+                    profile.max_blocking_seconds = max(profile.max_blocking_seconds, step_seconds)
+
+                try:
+                    value = yield future
+                except BaseException as e:
+                    function = self.coroutine.throw
+                    value = e
+                else:
+                    function = self.coroutine.send
+        except BaseException:
+            profile.errors += 1
+            raise
+        finally:
+            seconds = time.perf_counter() - start_time
+            profile.calls += 1
+            profile.seconds += seconds
+            profile.max_seconds = max(profile.max_seconds, seconds)
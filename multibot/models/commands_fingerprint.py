@@ -0,0 +1,26 @@
+__all__ = ['CommandsFingerprint']
+
+import datetime
+import hashlib
+import json
+from dataclasses import dataclass, field
+from typing import Any
+
+from flanautils import DCMongoBase, FlanaBase
+
+from multibot.models.enums import Platform
+
+
+@dataclass(eq=False)
+class CommandsFingerprint(DCMongoBase, FlanaBase):
+    collection_name = 'commands_fingerprint'
+    unique_keys = ('platform', 'bot_id')
+
+    platform: Platform = None
+    bot_id: int = None
+    fingerprint: str = None
+    last_update: datetime.datetime = field(default_factory=lambda: datetime.datetime.now(datetime.timezone.utc))
+
+    @staticmethod
+    def hash(commands_data: Any) -> str:
+        return hashlib.sha256(json.dumps(commands_data, sort_keys=True, default=str).encode()).hexdigest()
@@ -1,10 +1,15 @@
-__all__ = ['MessagesFormat', 'Platform']
+__all__ = ['DiscordCacheProfile', 'MessagesFormat', 'Platform', 'RateLimitScope', 'SendPriority']
 
 from enum import auto
 
 from flanautils import FlanaEnum
 
 
+class DiscordCacheProfile(FlanaEnum):
+    FULL = auto()
+    LEAN = auto()
+
+
 class MessagesFormat(FlanaEnum):
     SIMPLE = auto()
     NORMAL = auto()
@@ -15,7 +20,20 @@ class Platform(FlanaEnum):
     DISCORD = auto()
     TELEGRAM = auto()
     TWITCH = auto()
+    LOOPBACK = auto()
 
     @property
     def name(self):
         return super().name.title()
+
+
+class RateLimitScope(FlanaEnum):
+    USER = auto()
+    CHAT = auto()
+    GLOBAL = auto()
+
+
+class SendPriority(FlanaEnum):
+    INTERACTIVE = auto()
+    NORMAL = auto()
+    BULK = auto()
@@ -1,5 +1,8 @@
-__all__ = ['EventComponent']
+__all__ = ['EventComponent', 'Lazy', 'LazyAttribute', 'WeakAttribute']
 
+import copy
+import weakref
+from collections.abc import Callable
 from typing import Any
 
 from flanautils import DCMongoBase, FlanaBase
@@ -10,7 +13,70 @@ class EventComponent(DCMongoBase, FlanaBase):
         return self._mongo_repr()
 
     def _json_repr(self) -> Any:
-        return {k: v for k, v in super()._json_repr().items() if k not in ('original_object', 'original_event')}
+        return {k: v for k, v in super()._json_repr().items() if k not in ('original_object', 'original_event') and not isinstance(v, Lazy)}
 
     def _mongo_repr(self) -> Any:
-        return {k: v for k, v in super()._mongo_repr().items() if k not in ('original_object', 'original_event')}
+        return {k: v for k, v in super()._mongo_repr().items() if k not in ('original_object', 'original_event') and not isinstance(v, Lazy)}
+
+    def resolve(self):
+        for k, v in vars(self).items():
+            if not isinstance(v, Lazy):
+                getattr(self, k)
+
+
+class Lazy:
+    def __init__(self, load: Callable[..., Any], *args):
+        try:
+            self.load = weakref.WeakMethod(load)
+        except TypeError:
+            self.load = lambda: load
+        self.args = args
+
+    def __call__(self) -> Any:
+        if load := self.load():
+            return load(*self.args)
+
+    def __deepcopy__(self, memo: dict) -> Lazy:
+        lazy = copy.copy(self)
+        lazy.args = copy.deepcopy(self.args, memo)
+        return lazy
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.load()!r}, {', '.join(repr(arg) for arg in self.args)})"
+
+
+class LazyAttribute:
+    def __get__(self, instance: Any, owner: type = None) -> Any:
+        if instance is None:
+            return
+
+        if isinstance(value := vars(instance).get(self.name), Lazy):
+            value = vars(instance)[self.name] = value()
+
+        return value
+
+    def __set__(self, instance: Any, value: Any):
+        vars(instance)[self.name] = value
+
+    def __set_name__(self, owner: type, name: str):
+        self.name = name
+
+
+class WeakAttribute:
+    def __get__(self, instance: Any, owner: type = None) -> Any:
+        if instance is None:
+            return
+
+        value = vars(instance).get(self.name)
+        return value() if isinstance(value, weakref.ref) else value
+
+    def __set__(self, instance: Any, value: Any):
+        try:
+            value = weakref.ref(value)
+        except TypeError:
+            pass
+
+        vars(instance)[self.name] = value
+
+    def __set_name__(self, owner: type, name: str):
+        self.name = name
@@ -0,0 +1,129 @@
+__all__ = ['LoopStall', 'LoopWatchdog']
+
+import asyncio
+import contextlib
+import datetime
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+
+from multibot import constants
+from multibot.models.metrics import Metrics
+
+
+@dataclass
+class LoopStall:
+    seconds: float
+    stack: list[str]
+    task: str | None = None
+    callback: str | None = None
+    platform: str | None = None
+    chat_id: int | str | None = None
+    message_id: int | str | None = None
+    date: datetime.datetime = field(default_factory=lambda: datetime.datetime.now(datetime.timezone.utc))
+
+    def __str__(self):
+        return '\n'.join((
+            f'----- Loop stall: {self.seconds * 1000:.1f} ms -----',
+            f'task: {self.task}',
+            f'callback: {self.callback}',
+            f'platform: {self.platform}  chat: {self.chat_id}  message: {self.message_id}',
+            ''.join(self.stack).rstrip()
+        ))
+
+
+class LoopWatchdog:
+    def __init__(
+        self,
+        is_enabled: bool = None,
+        threshold: float = constants.LOOP_STALL_THRESHOLD_SECONDS,
+        interval: float = constants.LOOP_WATCHDOG_INTERVAL_SECONDS,
+        metrics: Metrics = None,
+        print_stalls=True
+    ):
+        self.is_enabled = constants.LOOP_WATCHDOG if is_enabled is None else is_enabled
+        self.threshold = threshold
+        self.interval = interval
+        self.metrics = metrics or Metrics()
+        self.print_stalls = print_stalls
+        self.stalls: deque[LoopStall] = deque(maxlen=constants.LOOP_STALLS_MEMORY)
+        self._activities: dict[asyncio.Task, tuple[str, str, int | str | None, int | str | None]] = {}
+        self._heartbeat_task: asyncio.Task | None = None
+        self._last_beat_time = 0.0
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._loop_thread_id: int | None = None
+        self._stop_event = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    async def _heartbeat(self):
+        while True:
+            self._last_beat_time = start_time = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            self.metrics.observe('multibot_loop_lag_seconds', max(time.perf_counter() - start_time - self.interval, 0))
+
+    def _watch(self):
+        reported_beat_time = None
+        while not self._stop_event.wait(self.interval):
+            last_beat_time = self._last_beat_time
+            if (lag := time.perf_counter() - last_beat_time - self.interval) < self.threshold or last_beat_time == reported_beat_time:
+                continue
+
+            reported_beat_time = last_beat_time
+            self._report_stall(lag)
+
+    def _report_stall(self, seconds: float):
+        if not (frame := sys._current_frames().get(self._loop_thread_id)):
+            return
+
+        stack = traceback.format_stack(frame)
+        task = asyncio.current_task(self._loop)
+        callback, platform, chat_id, message_id = self._activities.get(task, (None, None, None, None))
+        stall = LoopStall(seconds, stack, task.get_name() if task else None, callback, platform, chat_id, message_id)
+        self.stalls.append(stall)
+        self.metrics.increment('multibot_loop_stalls_total', platform=platform, callback=callback)
+
+        if self.print_stalls:
+            print(stall)
+
+    @contextlib.contextmanager
+    def activity(self, callback: str, platform: str, chat_id: int | str = None, message_id: int | str = None) -> Iterator[None]:
+        if not self.is_enabled or not (task := asyncio.current_task()):
+            yield
+            return
+
+        previous_activity = self._activities.get(task)
+        self._activities[task] = (callback, platform, chat_id, message_id)
+        try:
+            yield
+        finally:
+            if previous_activity:
+                self._activities[task] = previous_activity
+            else:
+                del self._activities[task]
+
+    def start(self, metrics: Metrics = None):
+        if not self.is_enabled or self._thread:
+            return
+
+        if metrics:
+            self.metrics = metrics
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._last_beat_time = time.perf_counter()
+        self._stop_event.clear()
+        self._heartbeat_task = self._loop.create_task(self._heartbeat())
+        self._thread = threading.Thread(target=self._watch, name='LoopWatchdog', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        if not self._thread:
+            return
+
+        self._stop_event.set()
+        self._heartbeat_task.cancel()
+        self._thread = None
+        self._heartbeat_task = None
@@ -0,0 +1,321 @@
+__all__ = ['MediaCache']
+
+import asyncio
+import hashlib
+import io
+import os
+import pathlib
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+import aiohttp
+import yarl
+from flanautils import ResponseError
+
+from multibot import constants
+from multibot.exceptions import LimitError
+
+
+class MediaCache:
+    def __init__(
+        self,
+        path: str | pathlib.Path = constants.MEDIA_CACHE_PATH,
+        memory_max_bytes: int = constants.MEDIA_CACHE_MEMORY_MAX_BYTES,
+        disk_max_bytes: int = constants.MEDIA_CACHE_DISK_MAX_BYTES,
+        max_keys: int = constants.MEDIA_CACHE_MAX_KEYS,
+        chunk_bytes: int = constants.MEDIA_CACHE_CHUNK_BYTES,
+        url_key_seconds: float | None = constants.MEDIA_CACHE_URL_KEY_SECONDS
+    ):
+        self.path = pathlib.Path(path)
+        self.memory_max_bytes = memory_max_bytes
+        self.disk_max_bytes = disk_max_bytes
+        self.max_keys = max_keys
+        self.chunk_bytes = chunk_bytes
+        self.url_key_seconds = url_key_seconds
+        self._memory: OrderedDict[str, bytes] = OrderedDict()
+        self._memory_bytes = 0
+        self._disk_sizes: OrderedDict[str, int] | None = None
+        self._disk_bytes = 0
+        self._disk_keys: dict[str, set[str]] = {}
+        self._disk_lock = threading.RLock()
+        self._key_hashes: OrderedDict[str, tuple[str, float | None]] = OrderedDict()
+        self._downloads: dict[tuple[str, int | None], asyncio.Task] = {}
+
+    def _add_file_to_disk(self, temporary_path: pathlib.Path, content_hash: str, key: str = None, expiration_time: float = None) -> pathlib.Path:
+        with self._disk_lock:
+            self._load_disk_index()
+            path = self._get_content_path(content_hash)
+
+            if content_hash in self._disk_sizes:
+                temporary_path.unlink(missing_ok=True)
+                os.utime(path)
+                self._disk_sizes.move_to_end(content_hash)
+            else:
+                temporary_path.replace(path)
+                self._disk_sizes[content_hash] = path.stat().st_size
+                self._disk_bytes += self._disk_sizes[content_hash]
+
+            if key:
+                self._write_key(key, content_hash, expiration_time)
+            self._evict_disk()
+
+            return path
+
+    def _add_to_memory(self, content_hash: str, bytes_: bytes):
+        if len(bytes_) > self.memory_max_bytes:
+            return
+
+        if content_hash in self._memory:
+            self._memory.move_to_end(content_hash)
+            return
+
+        self._memory[content_hash] = bytes_
+        self._memory_bytes += len(bytes_)
+        while self._memory_bytes > self.memory_max_bytes:
+            _, evicted_bytes = self._memory.popitem(last=False)
+            self._memory_bytes -= len(evicted_bytes)
+
+    def _add_key(self, key: str, content_hash: str, expiration_time: float = None):
+        self._key_hashes[key] = (content_hash, expiration_time)
+        self._key_hashes.move_to_end(key)
+        while len(self._key_hashes) > self.max_keys:
+            self._key_hashes.popitem(last=False)
+
+    async def _download(self, url: str, max_bytes: int | None) -> pathlib.Path:
+        request_url = url if url.startswith('http') else f'https://{url}'
+
+        hash_ = hashlib.sha256()
+        size = 0
+        temporary_path = self.get_temporary_path()
+        await asyncio.to_thread(temporary_path.parent.mkdir, parents=True, exist_ok=True)
+
+        async with aiohttp.ClientSession() as session, session.get(yarl.URL(request_url, encoded=True)) as response:
+            if response.status != 200:
+                raise ResponseError(f'{response.status} - {response.reason}')
+            if max_bytes is not None and (response.content_length or 0) > max_bytes:
+                raise LimitError
+
+            file = await asyncio.to_thread(temporary_path.open, 'wb')
+            try:
+                async for chunk in response.content.iter_chunked(self.chunk_bytes):
+                    size += len(chunk)
+                    if max_bytes is not None and size > max_bytes:
+                        raise LimitError
+                    hash_.update(chunk)
+                    await asyncio.to_thread(file.write, chunk)
+            except BaseException:
+                file.close()
+                temporary_path.unlink(missing_ok=True)
+                raise
+            file.close()
+
+        content_hash = hash_.hexdigest()
+        expiration_time = None if self.url_key_seconds is None else time.time() + self.url_key_seconds
+        self._add_key(url, content_hash, expiration_time)
+        return await asyncio.to_thread(self._add_file_to_disk, temporary_path, content_hash, url, expiration_time)
+
+    def _evict_disk(self):
+        while self._disk_bytes > self.disk_max_bytes and len(self._disk_sizes) > 1:
+            self._remove_from_disk(next(iter(self._disk_sizes)))
+
+    def _get_content_path(self, content_hash: str) -> pathlib.Path:
+        return self.path / 'contents' / content_hash
+
+    def _get_disk_size(self, content_hash: str) -> int:
+        with self._disk_lock:
+            self._load_disk_index()
+            return self._disk_sizes.get(content_hash, 0)
+
+    def _get_key_path(self, key: str) -> pathlib.Path:
+        return self._get_keys_path() / self.hash(key.encode())
+
+    def _get_keys_path(self) -> pathlib.Path:
+        return self.path / 'keys'
+
+    def _load_disk_index(self):
+        if self._disk_sizes is not None:
+            return
+
+        self._disk_sizes = OrderedDict()
+        self._disk_bytes = 0
+        self._disk_keys = {}
+        try:
+            stats = [(path.name, path.stat()) for path in (self.path / 'contents').iterdir() if path.is_file() and not path.suffix]
+        except FileNotFoundError:
+            stats = []
+
+        for name, stat in sorted(stats, key=lambda name_stat: name_stat[1].st_mtime):
+            self._disk_sizes[name] = stat.st_size
+            self._disk_bytes += stat.st_size
+
+        try:
+            key_paths = [path for path in self._get_keys_path().iterdir() if path.is_file()]
+        except FileNotFoundError:
+            return
+
+        for key_path in key_paths:
+            try:
+                content_hash, expiration_time = self._parse_key(key_path.read_text())
+            except FileNotFoundError:
+                continue
+
+            if content_hash in self._disk_sizes and (expiration_time is None or time.time() < expiration_time):
+                self._disk_keys.setdefault(content_hash, set()).add(key_path.name)
+            else:
+                key_path.unlink(missing_ok=True)
+
+    def _open_from_disk(self, content_hash: str) -> io.BufferedReader | None:
+        with self._disk_lock:
+            if not (path := self._touch(content_hash)):
+                return
+
+            try:
+                return path.open('rb')
+            except FileNotFoundError:
+                self._remove_from_disk(content_hash)
+
+    @staticmethod
+    def _parse_key(text: str) -> tuple[str, float | None]:
+        content_hash, _, expiration_time = text.partition(' ')
+        return content_hash, float(expiration_time) if expiration_time else None
+
+    def _read_key_from_disk(self, key: str) -> tuple[str, float | None] | None:
+        try:
+            return self._parse_key(self._get_key_path(key).read_text())
+        except FileNotFoundError:
+            pass
+
+    def _remove_from_disk(self, content_hash: str):
+        self._disk_bytes -= self._disk_sizes.pop(content_hash)
+        self._get_content_path(content_hash).unlink(missing_ok=True)
+        for key_path_name in self._disk_keys.pop(content_hash, ()):
+            (self._get_keys_path() / key_path_name).unlink(missing_ok=True)
+
+    def _touch(self, content_hash: str) -> pathlib.Path | None:
+        with self._disk_lock:
+            self._load_disk_index()
+            if content_hash not in self._disk_sizes:
+                return
+
+            path = self._get_content_path(content_hash)
+            try:
+                os.utime(path)
+            except FileNotFoundError:
+                self._remove_from_disk(content_hash)
+                return
+
+            self._disk_sizes.move_to_end(content_hash)
+            return path
+
+    def _write_key(self, key: str, content_hash: str, expiration_time: float = None):
+        key_path = self._get_key_path(key)
+        key_path.parent.mkdir(parents=True, exist_ok=True)
+        if (old_key := self._read_key_from_disk(key)) and old_key[0] != content_hash:
+            self._disk_keys.get(old_key[0], set()).discard(key_path.name)
+        key_path.write_text(content_hash if expiration_time is None else f'{content_hash} {expiration_time}')
+        self._disk_keys.setdefault(content_hash, set()).add(key_path.name)
+
+    def _write_to_disk(self, content_hash: str, bytes_: bytes, key: str = None):
+        if len(bytes_) > self.disk_max_bytes:
+            return
+
+        temporary_path = self.get_temporary_path()
+        temporary_path.parent.mkdir(parents=True, exist_ok=True)
+        temporary_path.write_bytes(bytes_)
+        self._add_file_to_disk(temporary_path, content_hash, key)
+
+    async def fetch(self, url: str) -> bytes:
+        if (bytes_ := await self.get_by_key(url)) is not None:
+            return bytes_
+
+        path = await self.fetch_file(url)
+        if (bytes_ := await self.get(path.name)) is None:
+            raise FileNotFoundError(path)
+
+        return bytes_
+
+    async def fetch_file(self, url: str, max_bytes: int = None) -> pathlib.Path:
+        if not (path := await self.get_file_by_key(url)):
+            try:
+                download = self._downloads[url, max_bytes]
+            except KeyError:
+                download = self._downloads[url, max_bytes] = asyncio.create_task(self._download(url, max_bytes))
+                download.add_done_callback(lambda _: self._downloads.pop((url, max_bytes), None))
+
+            path = await asyncio.shield(download)
+
+        if max_bytes is not None and await asyncio.to_thread(self._get_disk_size, path.name) > max_bytes:
+            raise LimitError
+
+        return path
+
+    async def get(self, content_hash: str) -> bytes | None:
+        try:
+            bytes_ = self._memory[content_hash]
+        except KeyError:
+            pass
+        else:
+            self._memory.move_to_end(content_hash)
+            return bytes_
+
+        if not (file := await asyncio.to_thread(self._open_from_disk, content_hash)):
+            return
+
+        with file:
+            bytes_ = await asyncio.to_thread(file.read)
+
+        self._add_to_memory(content_hash, bytes_)
+        return bytes_
+
+    async def get_by_key(self, key: str) -> bytes | None:
+        if content_hash := await self.get_hash(key):
+            return await self.get(content_hash)
+
+    async def get_file_by_key(self, key: str) -> pathlib.Path | None:
+        if content_hash := await self.get_hash(key):
+            return await asyncio.to_thread(self._touch, content_hash)
+
+    async def get_hash(self, key: str) -> str | None:
+        if not (key_hash := self._key_hashes.get(key)):
+            if not (key_hash := await asyncio.to_thread(self._read_key_from_disk, key)):
+                return
+
+            self._add_key(key, *key_hash)
+
+        content_hash, expiration_time = key_hash
+        if expiration_time is not None and time.time() >= expiration_time:
+            self._key_hashes.pop(key, None)
+            return
+
+        return content_hash
+
+    def get_temporary_path(self) -> pathlib.Path:
+        return self._get_content_path(f'{uuid.uuid4().hex}.tmp')
+
+    @staticmethod
+    def hash(bytes_: bytes) -> str:
+        return hashlib.sha256(bytes_).hexdigest()
+
+    @staticmethod
+    def hash_file(path: str | pathlib.Path, chunk_bytes: int = constants.MEDIA_CACHE_CHUNK_BYTES) -> str:
+        hash_ = hashlib.sha256()
+        with open(path, 'rb') as file:
+            while chunk := file.read(chunk_bytes):
+                hash_.update(chunk)
+        return hash_.hexdigest()
+
+    async def put(self, bytes_: bytes, key: str = None) -> str:
+        content_hash = self.hash(bytes_)
+        self._add_to_memory(content_hash, bytes_)
+        if key:
+            self._add_key(key, content_hash)
+        await asyncio.to_thread(self._write_to_disk, content_hash, bytes_, key)
+        return content_hash
+
+    async def put_file(self, path: pathlib.Path, key: str = None) -> pathlib.Path:
+        content_hash = await asyncio.to_thread(self.hash_file, path)
+        if key:
+            self._add_key(key, content_hash)
+        return await asyncio.to_thread(self._add_file_to_disk, path, content_hash, key)
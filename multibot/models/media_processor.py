@@ -0,0 +1,169 @@
+__all__ = ['MediaProcessor']
+
+import asyncio
+import concurrent.futures
+import json
+import multiprocessing
+import os
+import pathlib
+from concurrent.futures.process import BrokenProcessPool
+
+import flanautils
+
+from multibot import constants
+from multibot.models.media_cache import MediaCache
+
+
+async def _edit_metadata_file(input_file: pathlib.Path, output_file: pathlib.Path, metadata: dict, overwrite=True) -> pathlib.Path:
+    if not overwrite:
+        old_metadata = await flanautils.get_metadata(input_file)
+        metadata = {k: v for k, v in metadata.items() if k not in old_metadata}
+    if not metadata:
+        return input_file
+
+    if not (extension := input_file.suffix.strip('.')):
+        extension = await flanautils.get_format(input_file)
+        if 'mp4' in extension:
+            extension = 'mp4'
+    output_file = output_file.with_suffix(f'.{extension}')
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+
+    process = await asyncio.create_subprocess_exec(
+        'ffmpeg', '-i', str(input_file), '-c', 'copy', *(arg for k, v in metadata.items() for arg in ('-metadata', f'{k}={v}')), str(output_file),
+        stdin=asyncio.subprocess.DEVNULL,
+        stdout=asyncio.subprocess.DEVNULL,
+        stderr=asyncio.subprocess.DEVNULL
+    )
+    if await process.wait():
+        output_file.unlink(missing_ok=True)
+        raise FileNotFoundError(output_file)
+
+    return output_file
+
+
+_FILE_TRANSFORMS = {'edit_metadata': _edit_metadata_file}
+
+
+def _run_transform(transform_name: str, input_file: bytes | pathlib.Path, kwargs: dict, output_file: pathlib.Path = None) -> bytes | pathlib.Path:
+    if output_file:
+        return asyncio.run(_FILE_TRANSFORMS[transform_name](input_file, output_file, **kwargs))
+
+    return asyncio.run(getattr(flanautils, transform_name)(input_file, **kwargs))
+
+
+class MediaProcessor:
+    def __init__(
+        self,
+        media_cache: MediaCache | None = None,
+        max_workers: int | None = constants.MEDIA_PROCESSOR_MAX_WORKERS,
+        max_queued: int = constants.MEDIA_PROCESSOR_MAX_QUEUED,
+        timeout: float | None = constants.MEDIA_PROCESSOR_TIMEOUT_SECONDS,
+        queue_timeout: float | None = constants.MEDIA_PROCESSOR_QUEUE_TIMEOUT_SECONDS
+    ):
+        self.media_cache = media_cache
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.queue_timeout = queue_timeout
+        self._executor: concurrent.futures.ProcessPoolExecutor | None = None
+        self._executor_jobs: dict[concurrent.futures.ProcessPoolExecutor, int] = {}
+        self._executor_output_files: dict[concurrent.futures.ProcessPoolExecutor, list[pathlib.Path]] = {}
+        self._queue_semaphore = asyncio.Semaphore((max_workers or os.cpu_count() or 1) + max_queued)
+        self._worker_semaphore = asyncio.Semaphore(max_workers or os.cpu_count() or 1)
+        self._transforms: dict[str, asyncio.Task] = {}
+
+    async def _transform(self, key: str, input_file: bytes | pathlib.Path, transform_name: str, kwargs: dict) -> bytes | pathlib.Path:
+        output_file = None
+        if self.media_cache:
+            if isinstance(input_file, pathlib.Path) and transform_name in _FILE_TRANSFORMS:
+                if transformed_file := await self.media_cache.get_file_by_key(key):
+                    return transformed_file
+                output_file = self.media_cache.get_temporary_path()
+            elif (transformed_bytes := await self.media_cache.get_by_key(key)) is not None:
+                return transformed_bytes
+
+        async with self._queue_semaphore:
+            try:
+                async with asyncio.timeout(self.queue_timeout):
+                    await self._worker_semaphore.acquire()
+            except TimeoutError:
+                print(f'{transform_name} waited more than {self.queue_timeout} seconds for a worker, using the untransformed media')
+                return input_file
+
+            try:
+                executor = self._get_executor()
+                self._executor_jobs[executor] = self._executor_jobs.get(executor, 0) + 1
+                is_worker_stuck = True
+                try:
+                    async with asyncio.timeout(self.timeout):
+                        transformed = await asyncio.get_running_loop().run_in_executor(executor, _run_transform, transform_name, input_file, kwargs, output_file)
+                except TimeoutError:
+                    print(f'{transform_name} timed out after {self.timeout} seconds, using the untransformed media')
+                    return input_file
+                except BrokenProcessPool:
+                    print(f'{transform_name} worker died, using the untransformed media')
+                    return input_file
+                except Exception:
+                    is_worker_stuck = False
+                    raise
+                else:
+                    is_worker_stuck = False
+                finally:
+                    if is_worker_stuck and output_file:
+                        self._executor_output_files.setdefault(executor, []).append(output_file)
+                    self._release_executor(executor, retire=is_worker_stuck)
+            finally:
+                self._worker_semaphore.release()
+
+        if isinstance(transformed, pathlib.Path):
+            if transformed == input_file:
+                return input_file
+            return await self.media_cache.put_file(transformed, key)
+
+        if self.media_cache:
+            await self.media_cache.put(transformed, key)
+
+        return transformed
+
+    def _get_executor(self) -> concurrent.futures.ProcessPoolExecutor:
+        if not self._executor:
+            self._executor = concurrent.futures.ProcessPoolExecutor(self.max_workers, mp_context=multiprocessing.get_context('spawn'))
+
+        return self._executor
+
+    def _release_executor(self, executor: concurrent.futures.ProcessPoolExecutor, retire=False):
+        if retire and self._executor is executor:
+            self._executor = None
+
+        self._executor_jobs[executor] -= 1
+        if self._executor is not executor and not self._executor_jobs[executor]:
+            del self._executor_jobs[executor]
+            executor.kill_workers()
+            for output_file in self._executor_output_files.pop(executor, ()):
+                for path in output_file.parent.glob(f'{output_file.stem}.*'):
+                    path.unlink(missing_ok=True)
+
+    async def edit_metadata(self, input_file: bytes | pathlib.Path, metadata: dict, overwrite=True) -> bytes | pathlib.Path:
+        return await self.transform(input_file, 'edit_metadata', metadata=metadata, overwrite=overwrite)
+
+    def shutdown(self, wait=False):
+        if self._executor:
+            self._executor.shutdown(wait=wait, cancel_futures=True)
+            self._executor = None
+
+    async def to_gif(self, input_file: bytes | pathlib.Path) -> bytes | pathlib.Path:
+        return await self.transform(input_file, 'to_gif')
+
+    async def transform(self, input_file: bytes | pathlib.Path, transform_name: str, **kwargs) -> bytes | pathlib.Path:
+        if isinstance(input_file, bytes):
+            input_hash = MediaCache.hash(input_file)
+        else:
+            input_hash = await asyncio.to_thread(MediaCache.hash_file, input_file)
+        key = f'{transform_name}:{input_hash}:{json.dumps(kwargs, sort_keys=True, default=str)}'
+
+        try:
+            transform = self._transforms[key]
+        except KeyError:
+            transform = self._transforms[key] = asyncio.create_task(self._transform(key, input_file, transform_name, kwargs))
+            transform.add_done_callback(lambda _: self._transforms.pop(key, None))
+
+        return await asyncio.shield(transform)
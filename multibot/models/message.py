@@ -10,7 +10,7 @@ from multibot import constants
 from multibot.models.buttons import ButtonsInfo
 from multibot.models.chat import Chat
 from multibot.models.enums import Platform
-from multibot.models.event_component import EventComponent
+from multibot.models.event_component import EventComponent, LazyAttribute, WeakAttribute
 from multibot.models.user import User
 
 
@@ -35,9 +35,10 @@ class Message(EventComponent):
     is_inline: bool = None
     is_deleted: bool = False
     chat: Chat = None
-    replied_message: Message = None
+    replied_message_id: int | str = None
+    replied_message: Message = LazyAttribute()
     original_object: constants.ORIGINAL_MESSAGE = None
-    original_event: constants.MESSAGE_EVENT = None
+    original_event: constants.MESSAGE_EVENT = WeakAttribute()
 
     def _mongo_repr(self) -> Any:
         return {k: v for k, v in super()._mongo_repr().items() if k not in ('buttons_info', 'data')}
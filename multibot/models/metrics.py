@@ -0,0 +1,144 @@
+__all__ = ['Metrics', 'MetricsCommandListener', 'PrometheusMetrics']
+
+import bisect
+import contextlib
+import http.server
+import threading
+import time
+from collections import defaultdict
+from collections.abc import Iterable, Iterator
+
+import pymongo.monitoring
+
+from multibot import constants
+
+
+class Metrics:
+    def increment(self, name: str, value: float = 1, **labels):
+        pass
+
+    def observe(self, name: str, value: float, **labels):
+        pass
+
+    def set(self, name: str, value: float, **labels):
+        pass
+
+    def time(self, name: str, **labels) -> contextlib.AbstractContextManager:
+        return contextlib.nullcontext()
+
+
+class MetricsCommandListener(pymongo.monitoring.CommandListener):
+    def __init__(self, metrics: Metrics):
+        self.metrics = metrics
+
+    def failed(self, event: pymongo.monitoring.CommandFailedEvent):
+        self.metrics.observe('multibot_database_command_seconds', event.duration_micros / 1e6, command=event.command_name)
+        self.metrics.increment('multibot_database_command_errors_total', command=event.command_name)
+
+    def started(self, event: pymongo.monitoring.CommandStartedEvent):
+        pass
+
+    def succeeded(self, event: pymongo.monitoring.CommandSucceededEvent):
+        self.metrics.observe('multibot_database_command_seconds', event.duration_micros / 1e6, command=event.command_name)
+
+
+class PrometheusMetrics(Metrics):
+    def __init__(self, buckets: Iterable[float] = constants.METRICS_HISTOGRAM_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self._counters: dict[tuple[str, tuple], float] = defaultdict(float)
+        self._gauges: dict[tuple[str, tuple], float] = {}
+        self._histograms: dict[tuple[str, tuple], list[float]] = {}
+        self._lock = threading.Lock()
+        self._http_server: http.server.ThreadingHTTPServer | None = None
+
+    @staticmethod
+    def _format_labels(labels: tuple[tuple[str, str], ...]) -> str:
+        if not labels:
+            return ''
+
+        formatted_labels = []
+        for k, v in labels:
+            v = str(v).replace('\\', r'\\').replace('"', r'\"').replace('\n', r'\n')
+            formatted_labels.append(f'{k}="{v}"')
+
+        return f"{{{','.join(formatted_labels)}}}"
+
+    def increment(self, name: str, value: float = 1, **labels):
+        with self._lock:
+            self._counters[name, tuple(sorted(labels.items()))] += value
+
+    def monitor_database(self):
+        pymongo.monitoring.register(MetricsCommandListener(self))
+
+    def observe(self, name: str, value: float, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            if not (histogram := self._histograms.get(key)):
+                histogram = self._histograms[key] = [0] * (len(self.buckets) + 3)
+            histogram[bisect.bisect_left(self.buckets, value)] += 1
+            histogram[-2] += value
+            histogram[-1] += 1
+
+    def render(self) -> str:
+        with self._lock:
+            counters = dict(self._counters)
+            gauges = dict(self._gauges)
+            histograms = {key: list(histogram) for key, histogram in self._histograms.items()}
+
+        lines = []
+        type_names = set()
+        for metrics, type_name in ((counters, 'counter'), (gauges, 'gauge')):
+            for (name, labels), value in sorted(metrics.items()):
+                if name not in type_names:
+                    type_names.add(name)
+                    lines.append(f'# TYPE {name} {type_name}')
+                lines.append(f'{name}{self._format_labels(labels)} {value}')
+
+        for (name, labels), histogram in sorted(histograms.items()):
+            if name not in type_names:
+                type_names.add(name)
+                lines.append(f'# TYPE {name} histogram')
+            cumulative_count = 0
+            for bucket, count in zip((*self.buckets, '+Inf'), histogram[:-2]):
+                cumulative_count += count
+                lines.append(f'{name}_bucket{self._format_labels((*labels, ('le', bucket)))} {cumulative_count}')
+            lines.append(f'{name}_sum{self._format_labels(labels)} {histogram[-2]}')
+            lines.append(f'{name}_count{self._format_labels(labels)} {histogram[-1]}')
+
+        return '\n'.join(lines) + '\n'
+
+    def set(self, name: str, value: float, **labels):
+        with self._lock:
+            self._gauges[name, tuple(sorted(labels.items()))] = value
+
+    def start_http_server(self, port: int = constants.METRICS_PORT, host: str = constants.METRICS_HOST):
+        metrics = self
+
+        class MetricsRequestHandler(http.server.BaseHTTPRequestHandler):
+            def do_GET(self):
+                body = metrics.render().encode()
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._http_server = http.server.ThreadingHTTPServer((host, port), MetricsRequestHandler)
+        threading.Thread(target=self._http_server.serve_forever, daemon=True).start()
+
+    def stop_http_server(self):
+        if self._http_server:
+            self._http_server.shutdown()
+            self._http_server.server_close()
+            self._http_server = None
+
+    @contextlib.contextmanager
+    def time(self, name: str, **labels) -> Iterator[None]:
+        start_time = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start_time, **labels)
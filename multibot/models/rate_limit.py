@@ -0,0 +1,75 @@
+__all__ = ['RateLimit', 'RateLimiter', 'TokenBucket']
+
+import datetime
+import time
+from collections.abc import Hashable
+from dataclasses import dataclass
+
+from flanautils import FlanaBase
+
+from multibot.models.enums import RateLimitScope
+
+
+class TokenBucket:
+    def __init__(self, capacity: int | float, seconds: int | float | datetime.timedelta):
+        if isinstance(seconds, datetime.timedelta):
+            seconds = seconds.total_seconds()
+
+        self.capacity = capacity
+        self.refill_rate = capacity / seconds
+        self.tokens = capacity
+        self.last_refill = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.last_refill) * self.refill_rate)
+        self.last_refill = now
+
+    def consume(self, tokens: int | float = 1) -> bool:
+        self._refill()
+        if self.tokens < tokens:
+            return False
+
+        self.tokens -= tokens
+        return True
+
+    @property
+    def is_full(self) -> bool:
+        self._refill()
+        return self.tokens >= self.capacity
+
+    def seconds_until_available(self, tokens: int | float = 1) -> float:
+        self._refill()
+        return max(0., (tokens - self.tokens) / self.refill_rate)
+
+
+@dataclass(frozen=True)
+class RateLimit(FlanaBase):
+    times: int = 1
+    seconds: int | float | datetime.timedelta = 1
+    scope: RateLimitScope = RateLimitScope.USER
+
+
+class RateLimiter:
+    def __init__(self):
+        self.buckets: dict[tuple[Hashable, RateLimit, int | str | None], TokenBucket] = {}
+
+    def check_old_buckets(self):
+        for key in [key for key, bucket in self.buckets.items() if bucket.is_full]:
+            del self.buckets[key]
+
+    def consume(self, key: Hashable, rate_limit: RateLimit, user_id: int | str = None, chat_id: int | str = None) -> bool:
+        match rate_limit.scope:
+            case RateLimitScope.USER:
+                scope_id = user_id
+            case RateLimitScope.CHAT:
+                scope_id = chat_id
+            case _:
+                scope_id = None
+
+        try:
+            bucket = self.buckets[key, rate_limit, scope_id]
+        except KeyError:
+            bucket = self.buckets[key, rate_limit, scope_id] = TokenBucket(rate_limit.times, rate_limit.seconds)
+
+        return bucket.consume()
@@ -0,0 +1,36 @@
+__all__ = ['ReconnectMetrics']
+
+import datetime
+from dataclasses import dataclass
+
+from flanautils import FlanaBase
+
+
+@dataclass
+class ReconnectMetrics(FlanaBase):
+    reconnections: int = 0
+    failed_attempts: int = 0
+    consecutive_failed_attempts: int = 0
+    last_disconnect_date: datetime.datetime = None
+    last_reconnect_date: datetime.datetime = None
+    last_downtime: datetime.timedelta = None
+    total_downtime: datetime.timedelta = datetime.timedelta()
+
+    def on_connected(self):
+        now = datetime.datetime.now(datetime.timezone.utc)
+        if self.last_disconnect_date:
+            self.reconnections += 1
+            self.last_reconnect_date = now
+            self.last_downtime = now - self.last_disconnect_date
+            self.total_downtime += self.last_downtime
+            self.last_disconnect_date = None
+        self.consecutive_failed_attempts = 0
+
+    def on_disconnected(self):
+        if not self.last_disconnect_date:
+            self.last_disconnect_date = datetime.datetime.now(datetime.timezone.utc)
+
+    def on_failed_attempt(self):
+        self.on_disconnected()
+        self.failed_attempts += 1
+        self.consecutive_failed_attempts += 1
@@ -1,14 +1,18 @@
 __all__ = ['RegisteredCallback']
 
+import datetime
+import types
 from collections.abc import Callable, Iterable, Mapping
 
 import flanautils
-from flanautils import FlanaBase
 
 from multibot import constants
+from multibot.models.rate_limit import RateLimit
 
 
-class RegisteredCallback(FlanaBase):
+class RegisteredCallback:
+    __slots__ = ('callback', 'extra_args', 'extra_kwargs', 'command_name', 'command_description', 'keywords', 'priority', 'min_score', 'always', 'default', 'rate_limit')
+
     def __init__(
         self,
         callback: Callable,
@@ -20,19 +24,21 @@ class RegisteredCallback(FlanaBase):
         priority: int | float = 1,
         min_score: float = constants.PARSER_MIN_SCORE_DEFAULT,
         always=False,
-        default=False
+        default=False,
+        rate_limit: RateLimit | tuple[int, int | float | datetime.timedelta] | None = None
     ):
-        self.callback = callback
-        self.extra_args = extra_args
-        self.extra_kwargs = extra_kwargs or {}
-        self.command_name = command_name
-        self.command_description = command_description
+        set_attribute = super().__setattr__
+        set_attribute('callback', callback)
+        set_attribute('extra_args', tuple(extra_args))
+        set_attribute('extra_kwargs', types.MappingProxyType(dict(extra_kwargs or {})))
+        set_attribute('command_name', command_name)
+        set_attribute('command_description', command_description)
 
         if not keywords:
-            self.keywords = ()
+            set_attribute('keywords', ())
         elif isinstance(keywords, str):
             text = flanautils.remove_accents(keywords.strip().lower())
-            self.keywords = (tuple(text.split()),)
+            set_attribute('keywords', (tuple(text.split()),))
         elif isinstance(keywords, Iterable) and any(not isinstance(keyword, str) and isinstance(keyword, Iterable) for keyword in keywords):
             def generator():
                 for element in keywords:
@@ -43,21 +49,29 @@ class RegisteredCallback(FlanaBase):
                         keywords_group = tuple(flanautils.remove_accents(keyword.strip().lower()) for keyword in element)
                     yield keywords_group
 
-            self.keywords = tuple(generator())
+            set_attribute('keywords', tuple(generator()))
         elif isinstance(keywords, Iterable) and any(isinstance(keyword, str) for keyword in keywords):
             keywords = (flanautils.remove_accents(keyword.strip().lower()).split() for keyword in keywords)
-            self.keywords = (tuple(flanautils.flatten(keywords, lazy=True)),)
+            set_attribute('keywords', (tuple(flanautils.flatten(keywords, lazy=True)),))
         else:
             raise TypeError('bad arguments')
 
-        self.priority = priority
-        self.min_score = min_score
-        self.always = always
-        self.default = default
+        set_attribute('priority', priority)
+        set_attribute('min_score', min_score)
+        set_attribute('always', always)
+        set_attribute('default', default)
+
+        if rate_limit is None or isinstance(rate_limit, RateLimit):
+            set_attribute('rate_limit', rate_limit)
+        else:
+            set_attribute('rate_limit', RateLimit(*rate_limit))
 
     def __call__(self, *args, **kwargs):
         return self.callback(*args, **kwargs)
 
+    def __delattr__(self, name: str):
+        raise AttributeError(f"'{type(self).__name__}' object is immutable")
+
     def __eq__(self, other):
         if isinstance(other, RegisteredCallback):
             return self.callback == other.callback
@@ -66,3 +80,9 @@ class RegisteredCallback(FlanaBase):
 
     def __hash__(self):
         return hash(self.callback)
+
+    def __repr__(self):
+        return f"{type(self).__name__}({getattr(self.callback, '__qualname__', self.callback)}, keywords={self.keywords!r}, command_name={self.command_name!r}, priority={self.priority!r})"
+
+    def __setattr__(self, name: str, value):
+        raise AttributeError(f"'{type(self).__name__}' object is immutable")
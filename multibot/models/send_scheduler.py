@@ -0,0 +1,111 @@
+__all__ = ['SendScheduler']
+
+import asyncio
+import datetime
+import itertools
+import time
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Any
+
+from multibot import constants
+from multibot.models.enums import SendPriority
+from multibot.models.rate_limit import TokenBucket
+
+
+class SendScheduler:
+    def __init__(
+        self,
+        global_times: int,
+        global_seconds: int | float | datetime.timedelta,
+        chat_times: int,
+        chat_seconds: int | float | datetime.timedelta,
+        get_retry_after: Callable[[Exception], int | float | None] = None,
+        max_retries: int = constants.SEND_MAX_RETRIES,
+        max_retry_after: int | float = constants.SEND_MAX_RETRY_AFTER_SECONDS
+    ):
+        self.global_bucket = TokenBucket(global_times, global_seconds)
+        self.chat_buckets: dict[Hashable, TokenBucket] = {}
+        self.chat_times = chat_times
+        self.chat_seconds = chat_seconds
+        self.get_retry_after = get_retry_after
+        self.max_retries = max_retries
+        self.max_retry_after = max_retry_after
+        self._waiters: list[tuple[int, int, Hashable, asyncio.Future]] = []
+        self._waiters_counter = itertools.count()
+        self._paused_until = 0
+        self._wake_up = asyncio.Event()
+        self._dispatcher_task: asyncio.Task | None = None
+
+    async def _dispatch(self):
+        while self._waiters:
+            self._wake_up.clear()
+            self._waiters = [waiter for waiter in self._waiters if not waiter[3].done()]
+            wait_seconds = max(self._paused_until - time.monotonic(), self.global_bucket.seconds_until_available())
+
+            if wait_seconds <= 0:
+                for waiter in sorted(self._waiters):
+                    _, _, chat_id, future = waiter
+                    chat_bucket = self._get_chat_bucket(chat_id)
+                    if chat_bucket.consume():
+                        self.global_bucket.consume()
+                        self._waiters.remove(waiter)
+                        future.set_result(None)
+                        break
+
+                    chat_wait_seconds = chat_bucket.seconds_until_available()
+                    wait_seconds = chat_wait_seconds if wait_seconds <= 0 else min(wait_seconds, chat_wait_seconds)
+                else:
+                    if not self._waiters:
+                        break
+                    await self._sleep(wait_seconds)
+            else:
+                await self._sleep(wait_seconds)
+
+    def _get_chat_bucket(self, chat_id: Hashable) -> TokenBucket:
+        try:
+            return self.chat_buckets[chat_id]
+        except KeyError:
+            bucket = self.chat_buckets[chat_id] = TokenBucket(self.chat_times, self.chat_seconds)
+            return bucket
+
+    async def _sleep(self, seconds: float):
+        try:
+            await asyncio.wait_for(self._wake_up.wait(), seconds)
+        except TimeoutError:
+            pass
+
+    async def acquire(self, chat_id: Hashable = None, priority=SendPriority.NORMAL):
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.append((priority.value, next(self._waiters_counter), chat_id, future))
+        self._wake_up.set()
+        if not self._dispatcher_task or self._dispatcher_task.done():
+            self._dispatcher_task = asyncio.create_task(self._dispatch())
+
+        await future
+
+    def check_old_buckets(self):
+        for chat_id in [chat_id for chat_id, bucket in self.chat_buckets.items() if bucket.is_full]:
+            del self.chat_buckets[chat_id]
+
+    def pause(self, seconds: int | float):
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+        self._wake_up.set()
+
+    async def send(self, send_function: Callable[[], Awaitable], chat_id: Hashable = None, priority=SendPriority.NORMAL) -> Any:
+        for attempt in range(self.max_retries, -1, -1):
+            await self.acquire(chat_id, priority)
+            try:
+                return await send_function()
+            except Exception as e:
+                if (
+                    not attempt
+                    or
+                    not self.get_retry_after
+                    or
+                    (retry_after := self.get_retry_after(e)) is None
+                    or
+                    retry_after > self.max_retry_after
+                ):
+                    raise
+
+                self.pause(retry_after)
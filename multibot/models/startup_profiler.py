@@ -0,0 +1,53 @@
+__all__ = ['StartupProfiler']
+
+import contextlib
+import time
+from collections.abc import Iterator
+
+from multibot import constants
+
+
+class StartupProfiler:
+    def __init__(self, is_enabled: bool = None, start_time: float = None):
+        self.is_enabled = constants.STARTUP_PROFILING if is_enabled is None else is_enabled
+        self.start_time = time.perf_counter() if start_time is None else start_time
+        self.phases: dict[str, tuple[float, float]] = {}
+        self.is_finished = False
+
+    def __str__(self):
+        lines = ['----- Startup -----']
+        for name, (offset, duration) in self.phases.items():
+            lines.append(f'{name:<16} +{offset * 1000:9.1f} ms {duration * 1000:9.1f} ms')
+
+        return '\n'.join(lines)
+
+    def add_phase(self, name: str, start_time: float, end_time: float = None):
+        if not self.is_enabled or name in self.phases:
+            return
+
+        if end_time is None:
+            end_time = time.perf_counter()
+
+        self.phases[name] = (start_time - self.start_time, end_time - start_time)
+
+    def finish(self, name='first_message'):
+        if not self.is_enabled or self.is_finished:
+            return
+
+        self.is_finished = True
+        self.mark(name)
+        print(self)
+
+    def mark(self, name: str):
+        self.add_phase(name, time.perf_counter())
+
+    @contextlib.contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        start_time = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_phase(name, start_time)
+
+    def report(self) -> dict[str, dict[str, float]]:
+        return {name: {'offset_seconds': offset, 'seconds': duration} for name, (offset, duration) in self.phases.items()}
@@ -0,0 +1,216 @@
+__all__ = ['JsonLinesSpanExporter', 'OtlpHttpSpanExporter', 'Span', 'SpanExporter', 'SpanTracer', 'Tracer']
+
+import atexit
+import contextlib
+import contextvars
+import json
+import pathlib
+import queue
+import random
+import threading
+import time
+import urllib.request
+from collections.abc import Awaitable, Iterator, Sequence
+from dataclasses import dataclass, field
+from typing import Any
+
+from multibot import constants
+
+_current_span: contextvars.ContextVar[Span | None] = contextvars.ContextVar('current_span', default=None)
+
+
+@dataclass(eq=False)
+class Span:
+    name: str
+    trace_id: str
+    span_id: str
+    parent: Span | None = None
+    attributes: dict[str, Any] = field(default_factory=dict)
+    start_time_unix_nano: int = field(default_factory=time.time_ns)
+    end_time_unix_nano: int = 0
+    status_code: int = 0
+    status_message: str = ''
+
+    @staticmethod
+    def _to_otlp_value(value: Any) -> dict[str, Any]:
+        match value:
+            case bool():
+                return {'boolValue': value}
+            case int():
+                return {'intValue': str(value)}
+            case float():
+                return {'doubleValue': value}
+            case _:
+                return {'stringValue': str(value)}
+
+    @property
+    def parent_span_id(self) -> str | None:
+        return self.parent.span_id if self.parent else None
+
+    def set_attributes(self, **attributes):
+        self.attributes |= attributes
+        span = self.parent
+        while span:
+            span.attributes = attributes | span.attributes
+            span = span.parent
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            'name': self.name,
+            'trace_id': self.trace_id,
+            'span_id': self.span_id,
+            'parent_span_id': self.parent_span_id,
+            'start_time_unix_nano': self.start_time_unix_nano,
+            'end_time_unix_nano': self.end_time_unix_nano,
+            'duration_ms': (self.end_time_unix_nano - self.start_time_unix_nano) / 1e6,
+            'attributes': self.attributes,
+            'status_code': self.status_code,
+            'status_message': self.status_message
+        }
+
+    def to_otlp(self) -> dict[str, Any]:
+        otlp_span = {
+            'traceId': self.trace_id,
+            'spanId': self.span_id,
+            'name': self.name,
+            'kind': 1,
+            'startTimeUnixNano': str(self.start_time_unix_nano),
+            'endTimeUnixNano': str(self.end_time_unix_nano),
+            'attributes': [{'key': k, 'value': self._to_otlp_value(v)} for k, v in self.attributes.items() if v is not None],
+            'status': {'code': self.status_code, 'message': self.status_message}
+        }
+        if self.parent:
+            otlp_span['parentSpanId'] = self.parent.span_id
+
+        return otlp_span
+
+
+class SpanExporter:
+    def export(self, spans: Sequence[Span]):
+        pass
+
+    def shutdown(self):
+        pass
+
+
+class JsonLinesSpanExporter(SpanExporter):
+    def __init__(self, path: str | pathlib.Path = constants.TRACING_PATH):
+        self.path = pathlib.Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+    def export(self, spans: Sequence[Span]):
+        with open(self.path, 'a') as file:
+            file.writelines(f'{json.dumps(span.to_dict(), default=str)}\n' for span in spans)
+
+
+class OtlpHttpSpanExporter(SpanExporter):
+    def __init__(self, endpoint: str = constants.TRACING_OTLP_ENDPOINT, service_name: str = constants.TRACING_SERVICE_NAME, timeout: float = 10):
+        self.endpoint = endpoint
+        self.service_name = service_name
+        self.timeout = timeout
+
+    def export(self, spans: Sequence[Span]):
+        body = {
+            'resourceSpans': [{
+                'resource': {'attributes': [{'key': 'service.name', 'value': {'stringValue': self.service_name}}]},
+                'scopeSpans': [{'scope': {'name': 'multibot'}, 'spans': [span.to_otlp() for span in spans]}]
+            }]
+        }
+        request = urllib.request.Request(self.endpoint, json.dumps(body).encode(), {'Content-Type': 'application/json'})
+        with urllib.request.urlopen(request, timeout=self.timeout):
+            pass
+
+
+class Tracer:
+    def set_attributes(self, **attributes):
+        pass
+
+    def span(self, name: str, **attributes) -> contextlib.AbstractContextManager:
+        return contextlib.nullcontext()
+
+    async def trace(self, name: str, awaitable: Awaitable, **attributes) -> Any:
+        return await awaitable
+
+
+class SpanTracer(Tracer):
+    def __init__(
+        self,
+        exporter: SpanExporter,
+        batch_size: int = constants.TRACING_BATCH_SIZE,
+        flush_interval: float = constants.TRACING_FLUSH_INTERVAL_SECONDS
+    ):
+        self.exporter = exporter
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._finished_spans: queue.SimpleQueue[Span | None] = queue.SimpleQueue()
+        self._thread: threading.Thread | None = None
+        self._thread_lock = threading.Lock()
+
+    def _export_finished_spans(self):
+        is_stopped = False
+        while not is_stopped:
+            spans = []
+            deadline = time.monotonic() + self.flush_interval
+            while len(spans) < self.batch_size and (timeout := deadline - time.monotonic()) > 0:
+                try:
+                    span = self._finished_spans.get(timeout=timeout)
+                except queue.Empty:
+                    break
+                if span is None:
+                    is_stopped = True
+                    break
+                spans.append(span)
+
+            if spans:
+                # noinspection PyBroadException
+                try:
+                    self.exporter.export(spans)
+                except Exception as e:
+                    print(f'{type(e).__name__} exporting {len(spans)} spans: {e}')
+
+    def _finish(self, span: Span):
+        span.end_time_unix_nano = time.time_ns()
+        if not self._thread:
+            with self._thread_lock:
+                if not self._thread:
+                    self._thread = threading.Thread(target=self._export_finished_spans, name='SpanTracer', daemon=True)
+                    self._thread.start()
+                    atexit.register(self.shutdown)
+        self._finished_spans.put(span)
+
+    def set_attributes(self, **attributes):
+        if span := _current_span.get():
+            span.set_attributes(**attributes)
+
+    def shutdown(self):
+        with self._thread_lock:
+            if not self._thread:
+                return
+
+            self._finished_spans.put(None)
+            self._thread.join()
+            self._thread = None
+            atexit.unregister(self.shutdown)
+        self.exporter.shutdown()
+
+    @contextlib.contextmanager
+    def span(self, name: str, **attributes) -> Iterator[Span]:
+        if parent := _current_span.get():
+            span = Span(name, parent.trace_id, f'{random.getrandbits(64):016x}', parent, parent.attributes | attributes)
+        else:
+            span = Span(name, f'{random.getrandbits(128):032x}', f'{random.getrandbits(64):016x}', attributes=attributes)
+
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.status_code = 2
+            span.status_message = f'{type(e).__name__}: {e}'
+            raise
+        finally:
+            _current_span.reset(token)
+            self._finish(span)
+
+    async def trace(self, name: str, awaitable: Awaitable, **attributes) -> Any:
+        with self.span(name, **attributes):
+            return await awaitable